@@ -126,9 +126,17 @@ class AppDelegate: NSObject, NSApplicationDelegate, NSMenuDelegate, NSPopoverDel
         animator?.stop()
 
         let mode = currentDisplayMode
-        let newAnimator = FrameAnimator(buttInfo: buttInfo, lineWeight: currentLineWeight)
-        let size = NSSize(width: currentIconSize, height: currentIconSize)
-        menuBarFrames = newAnimator.frames.map { mode.processFrame($0, size: size) }
+        let newAnimator: FrameAnimator
+        if let baked = FrameAnimator.variantFrames(
+            for: buttInfo, mode: mode, lineWeight: currentLineWeight, points: currentIconSize
+        ) {
+            newAnimator = FrameAnimator(buttInfo: buttInfo, frames: baked)
+            menuBarFrames = baked
+        } else {
+            newAnimator = FrameAnimator(buttInfo: buttInfo, lineWeight: currentLineWeight)
+            let size = NSSize(width: currentIconSize, height: currentIconSize)
+            menuBarFrames = newAnimator.frames.map { mode.processFrame($0, size: size) }
+        }
 
         animatorSubscription = newAnimator.$currentFrameIndex
             .receive(on: DispatchQueue.main)
@@ -0,0 +1,109 @@
+import Foundation
+
+// Reads the compact manifests the asset pipelines write next to the JSON
+// ones (ButtFrames/manifest.bin, sounds/sounds-manifest.bin). The layout
+// is documented in scripts/binary_manifest.py. The file is memory-mapped
+// and every field is read in place at a fixed offset, so loading does no
+// JSON tokenizing or float parsing.
+
+enum ManifestReaderError: Error, LocalizedError {
+    case badHeader(String)
+    case outOfBounds(Int)
+
+    var errorDescription: String? {
+        switch self {
+        case .badHeader(let reason): return "Bad manifest header: \(reason)"
+        case .outOfBounds(let offset): return "Manifest read out of bounds at byte \(offset)"
+        }
+    }
+}
+
+struct ManifestReader {
+    static let formatVersion = 2
+    static let headerSize = 32
+
+    let count: Int
+    private let data: Data
+    private let recordSize: Int
+    private let stringsOffset: Int
+    private let dataOffset: Int
+
+    init(url: URL, magic: String, recordSize: Int) throws {
+        data = try Data(contentsOf: url, options: .alwaysMapped)
+        guard data.count >= Self.headerSize, data.prefix(4) == Data(magic.utf8) else {
+            throw ManifestReaderError.badHeader("expected \(magic)")
+        }
+        let version = Int(try Self.load(data, 4, as: UInt16.self))
+        guard version == Self.formatVersion, Int(try Self.load(data, 6, as: UInt16.self)) == recordSize else {
+            throw ManifestReaderError.badHeader("unsupported version \(version)")
+        }
+        self.recordSize = recordSize
+        count = Int(try Self.load(data, 8, as: UInt32.self))
+        stringsOffset = Int(try Self.load(data, 12, as: UInt32.self))
+        dataOffset = Int(try Self.load(data, 20, as: UInt32.self))
+        let stringsEnd = stringsOffset + Int(try Self.load(data, 16, as: UInt32.self))
+        let dataEnd = dataOffset + Int(try Self.load(data, 24, as: UInt32.self))
+        guard Self.headerSize + count * recordSize <= stringsOffset,
+              stringsEnd <= dataOffset, dataEnd <= data.count else {
+            throw ManifestReaderError.badHeader("sections don't fit the file")
+        }
+    }
+
+    /// Byte offset of record `index`.
+    func record(_ index: Int) -> Int {
+        Self.headerSize + index * recordSize
+    }
+
+    /// Byte offset of a data-section reference stored at `offset`.
+    func dataRef(at offset: Int) throws -> Int {
+        try dataOffset + u32(offset)
+    }
+
+    private static func load<T: FixedWidthInteger>(_ data: Data, _ offset: Int, as type: T.Type) throws -> T {
+        guard offset >= 0, offset + MemoryLayout<T>.size <= data.count else {
+            throw ManifestReaderError.outOfBounds(offset)
+        }
+        return T(littleEndian: data.withUnsafeBytes { $0.loadUnaligned(fromByteOffset: offset, as: T.self) })
+    }
+
+    func u8(_ offset: Int) throws -> Int { Int(try Self.load(data, offset, as: UInt8.self)) }
+    func u16(_ offset: Int) throws -> Int { Int(try Self.load(data, offset, as: UInt16.self)) }
+    func u32(_ offset: Int) throws -> Int { Int(try Self.load(data, offset, as: UInt32.self)) }
+
+    /// The string whose (offset, length) reference is stored at `offset`.
+    func string(at offset: Int) throws -> String {
+        let start = try stringsOffset + u32(offset)
+        let end = try start + u32(offset + 4)
+        guard end <= dataOffset else { throw ManifestReaderError.outOfBounds(start) }
+        return String(decoding: data[start..<end], as: UTF8.self)
+    }
+
+    /// `count` u16 (x, y, w, h) rects starting at `offset`.
+    func rects(at offset: Int, count: Int) throws -> [AtlasRect] {
+        try (0..<count).map { i in
+            let base = offset + 8 * i
+            return AtlasRect(x: try u16(base), y: try u16(base + 2), w: try u16(base + 4), h: try u16(base + 6))
+        }
+    }
+
+    /// `count` waveform bars stored one byte each (bar = byte / 255), rounded
+    /// to the 2 decimals the JSON manifest has so both give identical values.
+    func waveform(at offset: Int, count: Int) throws -> [Float] {
+        try (0..<count).map { i in (Float(try u8(offset + i)) / 255 * 100).rounded() / 100 }
+    }
+
+    /// The waveform pyramid starting at `offset`: u16 level count, u16 bars
+    /// per level, then every level's RMS bytes and every level's peak bytes.
+    func pyramid(at offset: Int) throws -> WaveformPyramid {
+        let levels = try u16(offset)
+        let bars = try (0..<levels).map { try u16(offset + 2 + 2 * $0) }
+        let start = offset + 2 + 2 * levels
+        let total = bars.reduce(0, +)
+        guard start + 2 * total <= data.count else { throw ManifestReaderError.outOfBounds(start) }
+        return WaveformPyramid(
+            bars: bars,
+            rms: data.subdata(in: start..<(start + total)),
+            peak: data.subdata(in: (start + total)..<(start + 2 * total))
+        )
+    }
+}
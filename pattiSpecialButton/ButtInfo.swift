@@ -5,11 +5,54 @@ private let logger = Logger(subsystem: Bundle.main.bundleIdentifier ?? "pattiSpe
 
 private let validIdPattern = try! NSRegularExpression(pattern: "^[a-z0-9-]+$")
 
+struct AtlasRect: Codable {
+    let x: Int
+    let y: Int
+    let w: Int
+    let h: Int
+
+    var cgRect: CGRect { CGRect(x: x, y: y, width: w, height: h) }
+}
+
+// Present when the pipeline packed this butt into sprite sheets
+// (atlas.png / atlas_bold.png) instead of one PNG per frame.
+struct ButtAtlas: Codable {
+    let frames: [AtlasRect]
+}
+
+// Present when the pipeline cropped transparent borders: each frame's
+// pixel rect on the original w x h canvas, in frame order.
+struct ButtTrim: Codable {
+    let w: Int
+    let h: Int
+    let frames: [AtlasRect]
+}
+
+// One row of a variant sheet: every frame at `size` pixels, side by side.
+struct VariantStrip: Codable {
+    let size: Int
+    let y: Int
+
+    func rect(frame index: Int) -> CGRect {
+        CGRect(x: index * size, y: y, width: size, height: size)
+    }
+}
+
+// Present when the pipeline pre-rendered display modes at menu bar and
+// Touch Bar pixel sizes (variant_<mode>.png / variant_<mode>_bold.png).
+struct ButtVariants: Codable {
+    let modes: [String]
+    let strips: [VariantStrip]
+}
+
 struct ButtInfo: Codable, Identifiable {
     let id: String
     let name: String
     let frameCount: Int
     let frameDelays: [Int]
+    let atlas: ButtAtlas?
+    let trim: ButtTrim?
+    let variants: ButtVariants?
 
     var hasValidId: Bool {
         validIdPattern.firstMatch(in: id, range: NSRange(id.startIndex..., in: id)) != nil
@@ -20,25 +63,95 @@ struct ButtManifest: Codable {
     let butts: [ButtInfo]
 }
 
-// Decoded once on first access, shared across all callers.
-// Swift global lets are lazy and thread-safe by default.
-let buttManifest: [ButtInfo] = {
+// Binary form (manifest.bin): a 36-byte record per butt — see
+// scripts/binary_manifest.py for the layout.
+extension ButtInfo {
+    static let binaryMagic = "PBTM"
+    static let binaryRecordSize = 36
+
+    private static let atlasFlag = 1
+    private static let trimFlag = 2
+    private static let variantsFlag = 4
+
+    init(reader r: ManifestReader, record index: Int) throws {
+        let base = r.record(index)
+        let count = try r.u16(base + 16)
+        let flags = try r.u16(base + 18)
+        let delays = try r.dataRef(at: base + 20)
+
+        var atlas: ButtAtlas?
+        if flags & Self.atlasFlag != 0 {
+            atlas = ButtAtlas(frames: try r.rects(at: r.dataRef(at: base + 24), count: count))
+        }
+        var trim: ButtTrim?
+        if flags & Self.trimFlag != 0 {
+            let offset = try r.dataRef(at: base + 28)
+            trim = ButtTrim(w: try r.u16(offset), h: try r.u16(offset + 2),
+                            frames: try r.rects(at: offset + 4, count: count))
+        }
+        var variants: ButtVariants?
+        if flags & Self.variantsFlag != 0 {
+            let offset = try r.dataRef(at: base + 32)
+            let modeCount = try r.u16(offset)
+            let stripCount = try r.u16(offset + 2)
+            let strips = offset + 4 + 8 * modeCount
+            variants = ButtVariants(
+                modes: try (0..<modeCount).map { try r.string(at: offset + 4 + 8 * $0) },
+                strips: try (0..<stripCount).map {
+                    VariantStrip(size: try r.u16(strips + 4 * $0), y: try r.u16(strips + 4 * $0 + 2))
+                }
+            )
+        }
+
+        self.init(
+            id: try r.string(at: base),
+            name: try r.string(at: base + 8),
+            frameCount: count,
+            frameDelays: try (0..<count).map { try r.u16(delays + 2 * $0) },
+            atlas: atlas,
+            trim: trim,
+            variants: variants
+        )
+    }
+}
+
+// manifest.bin if the bundle has a readable one, else manifest.json.
+private func loadButts() -> [ButtInfo]? {
+    if let url = Bundle.main.url(
+        forResource: Assets.manifestFile, withExtension: "bin", subdirectory: Assets.buttFramesDir
+    ) {
+        do {
+            let reader = try ManifestReader(
+                url: url, magic: ButtInfo.binaryMagic, recordSize: ButtInfo.binaryRecordSize
+            )
+            return try (0..<reader.count).map { try ButtInfo(reader: reader, record: $0) }
+        } catch {
+            logger.warning("Failed to read binary butt manifest, using JSON: \(error.localizedDescription)")
+        }
+    }
+
     guard let url = Bundle.main.url(
         forResource: Assets.manifestFile, withExtension: "json", subdirectory: Assets.buttFramesDir
     ) else {
         logger.error("Butt manifest not found in bundle")
-        return []
+        return nil
     }
     do {
         let data = try Data(contentsOf: url)
-        let manifest = try JSONDecoder().decode(ButtManifest.self, from: data)
-        let valid = manifest.butts.filter { $0.hasValidId }
-        if valid.count != manifest.butts.count {
-            logger.warning("Filtered \(manifest.butts.count - valid.count) butt(s) with invalid IDs")
-        }
-        return valid
+        return try JSONDecoder().decode(ButtManifest.self, from: data).butts
     } catch {
         logger.error("Failed to load butt manifest: \(error.localizedDescription)")
-        return []
+        return nil
+    }
+}
+
+// Decoded once on first access, shared across all callers.
+// Swift global lets are lazy and thread-safe by default.
+let buttManifest: [ButtInfo] = {
+    guard let butts = loadButts() else { return [] }
+    let valid = butts.filter { $0.hasValidId }
+    if valid.count != butts.count {
+        logger.warning("Filtered \(butts.count - valid.count) butt(s) with invalid IDs")
     }
+    return valid
 }()
@@ -38,11 +38,15 @@ enum DisplayMode: String {
             }
             return true
         }
+        result.isTemplate = isTemplate
+        return result
+    }
+
+    var isTemplate: Bool {
         switch self {
-        case .stencil, .outline: result.isTemplate = true
-        case .original: result.isTemplate = false
+        case .stencil, .outline: return true
+        case .original: return false
         }
-        return result
     }
 }
 
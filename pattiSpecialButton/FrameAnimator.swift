@@ -1,5 +1,6 @@
 import AppKit
 import Combine
+import ImageIO
 
 class FrameAnimator: ObservableObject {
     @Published var currentFrameIndex: Int = 0
@@ -12,26 +13,96 @@ class FrameAnimator: ObservableObject {
         frames.isEmpty ? nil : frames[currentFrameIndex]
     }
 
-    init(buttInfo: ButtInfo, displayMode: DisplayMode? = nil, lineWeight: LineWeight = .regular) {
+    init(buttInfo: ButtInfo, frames: [NSImage]) {
+        self.frames = frames
+        self.frameDelays = buttInfo.frameDelays.map { max(Double($0) / 1000.0, 0.01) }
+    }
+
+    convenience init(buttInfo: ButtInfo, displayMode: DisplayMode? = nil, lineWeight: LineWeight = .regular) {
         var loaded: [NSImage] = []
 
         if let buttDir = Bundle.main.url(
             forResource: buttInfo.id, withExtension: nil, subdirectory: Assets.buttFramesDir
         ) {
-            for i in 0..<buttInfo.frameCount {
-                let filename = String(format: "frame_%02d\(lineWeight.frameSuffix).png", i)
-                let url = buttDir.appendingPathComponent(filename)
-                guard let image = NSImage(contentsOf: url) else { continue }
-                loaded.append(image)
+            if let atlas = buttInfo.atlas {
+                let url = buttDir.appendingPathComponent("atlas\(lineWeight.frameSuffix).png")
+                loaded = Self.loadAtlasFrames(atlas, from: url)
+            } else {
+                for i in 0..<buttInfo.frameCount {
+                    let filename = String(format: "frame_%02d\(lineWeight.frameSuffix).png", i)
+                    let url = buttDir.appendingPathComponent(filename)
+                    guard let image = NSImage(contentsOf: url) else { continue }
+                    loaded.append(image)
+                }
             }
         }
 
+        if let trim = buttInfo.trim {
+            let canvas = NSSize(width: trim.w, height: trim.h)
+            loaded = zip(loaded, trim.frames).map { Self.untrim($0, rect: $1, canvas: canvas) }
+        }
         if let mode = displayMode {
-            self.frames = loaded.map { mode.processFrame($0, size: $0.size) }
-        } else {
-            self.frames = loaded
+            loaded = loaded.map { mode.processFrame($0, size: $0.size) }
+        }
+        self.init(buttInfo: buttInfo, frames: loaded)
+    }
+
+    // A trimmed frame holds only its non-transparent box. Present it at its
+    // original canvas size by drawing the box at its offset; the transparent
+    // border is never decoded or composited.
+    private static func untrim(_ image: NSImage, rect: AtlasRect, canvas: NSSize) -> NSImage {
+        NSImage(size: canvas, flipped: true) { _ in
+            image.draw(in: rect.cgRect, from: .zero, operation: .sourceOver,
+                       fraction: 1.0, respectFlipped: true, hints: nil)
+            return true
+        }
+    }
+
+    // Pre-rendered frames for a display mode at `points`, with a @1x and
+    // @2x representation each when the pipeline baked those sizes. Ready
+    // to draw as-is: no compositing or resampling. Nil if this butt has no
+    // variant for the mode and size, so callers fall back to processFrame.
+    static func variantFrames(
+        for buttInfo: ButtInfo, mode: DisplayMode, lineWeight: LineWeight, points: CGFloat
+    ) -> [NSImage]? {
+        guard let variants = buttInfo.variants, variants.modes.contains(mode.rawValue) else { return nil }
+        let strips = [1, 2].compactMap { scale in
+            variants.strips.first { CGFloat($0.size) == points * CGFloat(scale) }
+        }
+        guard !strips.isEmpty,
+              let buttDir = Bundle.main.url(
+                forResource: buttInfo.id, withExtension: nil, subdirectory: Assets.buttFramesDir
+              ) else { return nil }
+
+        let url = buttDir.appendingPathComponent("variant_\(mode.rawValue)\(lineWeight.frameSuffix).png")
+        guard let source = CGImageSourceCreateWithURL(url as CFURL, nil),
+              let sheet = CGImageSourceCreateImageAtIndex(source, 0, nil) else { return nil }
+
+        let size = NSSize(width: points, height: points)
+        var frames: [NSImage] = []
+        for i in 0..<buttInfo.frameCount {
+            let image = NSImage(size: size)
+            for strip in strips {
+                guard let cropped = sheet.cropping(to: strip.rect(frame: i)) else { return nil }
+                let rep = NSBitmapImageRep(cgImage: cropped)
+                rep.size = size
+                image.addRepresentation(rep)
+            }
+            image.isTemplate = mode.isTemplate
+            frames.append(image)
+        }
+        return frames
+    }
+
+    // One file open and decode for the whole animation; frames are cropped
+    // views into the decoded sheet.
+    private static func loadAtlasFrames(_ atlas: ButtAtlas, from url: URL) -> [NSImage] {
+        guard let source = CGImageSourceCreateWithURL(url as CFURL, nil),
+              let sheet = CGImageSourceCreateImageAtIndex(source, 0, nil) else { return [] }
+        return atlas.frames.compactMap { rect in
+            guard let cropped = sheet.cropping(to: rect.cgRect) else { return nil }
+            return NSImage(cgImage: cropped, size: NSSize(width: rect.w, height: rect.h))
         }
-        self.frameDelays = buttInfo.frameDelays.map { max(Double($0) / 1000.0, 0.01) }
     }
 
     func start() {
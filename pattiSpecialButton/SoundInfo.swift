@@ -10,10 +10,36 @@ private func isValidFilename(_ name: String) -> Bool {
         && validFilePattern.firstMatch(in: name, range: NSRange(name.startIndex..., in: name)) != nil
 }
 
+// RMS and peak waveform levels from 512 bars down to 8, halving each time
+// (see scripts/waveform_samples.py). rms and peak hold every level's bars
+// one byte each (value = byte / 255), finest level first; in the JSON
+// manifest they're base64, which JSONDecoder reads as Data.
+struct WaveformPyramid: Codable {
+    let bars: [Int]
+    let rms: Data
+    let peak: Data
+
+    /// The coarsest level with at least `count` bars (the finest level if
+    /// none has that many), so a waveform of any width needs no audio I/O.
+    func level(minimumBars count: Int) -> (rms: [Float], peak: [Float]) {
+        guard !bars.isEmpty else { return ([], []) }
+        let index = bars.lastIndex(where: { $0 >= count }) ?? 0
+        let start = bars[..<index].reduce(0, +)
+        let end = start + bars[index]
+        guard end <= rms.count, end <= peak.count else { return ([], []) }
+
+        func values(_ data: Data) -> [Float] {
+            data[(data.startIndex + start)..<(data.startIndex + end)].map { Float($0) / 255 }
+        }
+        return (values(rms), values(peak))
+    }
+}
+
 struct SoundSegment: Codable {
     let file: String
     let ext: String
     let waveform: [Float]?
+    let pyramid: WaveformPyramid?
 
     var bundleURL: URL? {
         Bundle.main.url(forResource: file, withExtension: ext, subdirectory: Assets.soundsDir)
@@ -31,6 +57,7 @@ struct SoundInfo: Codable, Identifiable {
     let shuffle: Bool?
     let source: String?
     let waveform: [Float]?
+    let pyramid: WaveformPyramid?
     let segments: [SoundSegment]?
 
     var isShuffle: Bool {
@@ -57,25 +84,112 @@ struct SoundInfo: Codable, Identifiable {
     }
 }
 
-// Decoded once on first access, shared across all callers.
-// Swift global lets are lazy and thread-safe by default.
-let soundManifest: [SoundInfo] = {
+// Binary form (sounds-manifest.bin): a 68-byte record per sound and a
+// 28-byte record per segment — see scripts/binary_manifest.py.
+extension SoundInfo {
+    static let binaryMagic = "PSND"
+    static let binaryRecordSize = 68
+    private static let segmentSize = 28
+
+    private static let fileFlag = 1
+    private static let extFlag = 2
+    private static let sourceFlag = 4
+    private static let waveformFlag = 8
+    private static let segmentsFlag = 16
+    private static let hasShuffleFlag = 32
+    private static let shuffleFlag = 64
+    private static let pyramidFlag = 128
+
+    init(reader r: ManifestReader, record index: Int) throws {
+        let base = r.record(index)
+        let flags = try r.u16(base + 48)
+
+        func optionalString(_ offset: Int, _ flag: Int) throws -> String? {
+            guard flags & flag != 0 else { return nil }
+            return try r.string(at: base + offset)
+        }
+
+        var waveform: [Float]?
+        if flags & Self.waveformFlag != 0 {
+            waveform = try r.waveform(at: r.dataRef(at: base + 52), count: r.u16(base + 50))
+        }
+        var pyramid: WaveformPyramid?
+        if flags & Self.pyramidFlag != 0 {
+            pyramid = try r.pyramid(at: r.dataRef(at: base + 64))
+        }
+        var segments: [SoundSegment]?
+        if flags & Self.segmentsFlag != 0 {
+            let offset = try r.dataRef(at: base + 60)
+            segments = try (0..<r.u16(base + 56)).map { i in
+                let seg = offset + Self.segmentSize * i
+                let segmentFlags = try r.u16(seg + 22)
+                var segmentWaveform: [Float]?
+                if segmentFlags & Self.waveformFlag != 0 {
+                    segmentWaveform = try r.waveform(at: r.dataRef(at: seg + 16), count: r.u16(seg + 20))
+                }
+                var segmentPyramid: WaveformPyramid?
+                if segmentFlags & Self.pyramidFlag != 0 {
+                    segmentPyramid = try r.pyramid(at: r.dataRef(at: seg + 24))
+                }
+                return SoundSegment(
+                    file: try r.string(at: seg), ext: try r.string(at: seg + 8),
+                    waveform: segmentWaveform, pyramid: segmentPyramid
+                )
+            }
+        }
+
+        self.init(
+            id: try r.string(at: base),
+            name: try r.string(at: base + 8),
+            category: try r.string(at: base + 16),
+            file: try optionalString(24, Self.fileFlag),
+            ext: try optionalString(32, Self.extFlag),
+            shuffle: flags & Self.hasShuffleFlag != 0 ? flags & Self.shuffleFlag != 0 : nil,
+            source: try optionalString(40, Self.sourceFlag),
+            waveform: waveform,
+            pyramid: pyramid,
+            segments: segments
+        )
+    }
+}
+
+// sounds-manifest.bin if the bundle has a readable one, else the JSON.
+private func loadSounds() -> [SoundInfo]? {
+    if let url = Bundle.main.url(
+        forResource: Assets.soundsManifestFile, withExtension: "bin", subdirectory: Assets.soundsDir
+    ) {
+        do {
+            let reader = try ManifestReader(
+                url: url, magic: SoundInfo.binaryMagic, recordSize: SoundInfo.binaryRecordSize
+            )
+            return try (0..<reader.count).map { try SoundInfo(reader: reader, record: $0) }
+        } catch {
+            logger.warning("Failed to read binary sound manifest, using JSON: \(error.localizedDescription)")
+        }
+    }
+
     guard let url = Bundle.main.url(
         forResource: Assets.soundsManifestFile, withExtension: "json", subdirectory: Assets.soundsDir
     ) else {
         logger.error("Sound manifest not found in bundle")
-        return []
+        return nil
     }
     do {
         let data = try Data(contentsOf: url)
-        let sounds = try JSONDecoder().decode([SoundInfo].self, from: data)
-        let valid = sounds.filter { $0.hasValidFiles }
-        if valid.count != sounds.count {
-            logger.warning("Filtered \(sounds.count - valid.count) sound(s) with invalid filenames")
-        }
-        return valid
+        return try JSONDecoder().decode([SoundInfo].self, from: data)
     } catch {
         logger.error("Failed to load sound manifest: \(error.localizedDescription)")
-        return []
+        return nil
+    }
+}
+
+// Decoded once on first access, shared across all callers.
+// Swift global lets are lazy and thread-safe by default.
+let soundManifest: [SoundInfo] = {
+    guard let sounds = loadSounds() else { return [] }
+    let valid = sounds.filter { $0.hasValidFiles }
+    if valid.count != sounds.count {
+        logger.warning("Filtered \(sounds.count - valid.count) sound(s) with invalid filenames")
     }
+    return valid
 }()
@@ -92,8 +92,17 @@ private class ParadeHolder: NSObject, NSTouchBarDelegate, NSScrubberDataSource,
     private func ensureLoaded(at index: Int) {
         guard animators[index] == nil else { return }
         let info = manifest[index]
-        let animator = FrameAnimator(buttInfo: info, lineWeight: lineWeight)
-        let frames = animator.frames.map { displayMode.processFrame($0, size: frameSize) }
+        let animator: FrameAnimator
+        let frames: [NSImage]
+        if let baked = FrameAnimator.variantFrames(
+            for: info, mode: displayMode, lineWeight: lineWeight, points: frameSize.width
+        ) {
+            animator = FrameAnimator(buttInfo: info, frames: baked)
+            frames = baked
+        } else {
+            animator = FrameAnimator(buttInfo: info, lineWeight: lineWeight)
+            frames = animator.frames.map { displayMode.processFrame($0, size: frameSize) }
+        }
         animators[index] = animator
         processedFrames[index] = frames
         if animator.frames.count > 1 { animator.start() }
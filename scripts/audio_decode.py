@@ -0,0 +1,346 @@
+"""Decode audio files into in-memory sample buffers.
+
+Used by waveform_samples.py and shuffle_segments.py so sound-check.py can
+decode each file once and share the samples: a shuffle source's waveform,
+its silence detection, its segment files and the segment waveforms all
+come from the same buffer instead of separate reads (and, for MP3s,
+separate ffmpeg launches).
+
+WAV (PCM 8/16/24/32-bit, float, WAVE_FORMAT_EXTENSIBLE) and AIFF/AIFF-C
+are parsed here and memory-mapped rather than read into Python; only
+genuinely compressed formats (MP3, M4A, ...) go through pydub and ffmpeg.
+"""
+
+import os
+import struct
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from scipy.io import wavfile
+
+
+class DecodedAudio(NamedTuple):
+    """Decoded samples plus the rate needed to interpret them.
+
+    samples is (frames, channels) in the file's native dtype: int8/int16/
+    int32 PCM, uint8 for 8-bit WAV, or float32/float64 for float WAV.
+    For 24-bit or big-endian files it's a _ConvertedSamples, which
+    converts just the rows sliced from it.
+    """
+
+    samples: np.ndarray
+    frame_rate: int
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def duration_ms(self) -> int:
+        """Length in milliseconds, rounded the same way as len(AudioSegment)."""
+        return round(1000 * len(self.samples) / self.frame_rate)
+
+
+class UnsupportedEncoding(Exception):
+    """A WAV/AIFF container whose sample encoding isn't plain PCM or float."""
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Sample sizes in bytes that to_float_mono can normalize, by kind
+SAMPLE_BYTES = {"i": (1, 2, 3, 4), "f": (4, 8)}
+
+# AIFF-C compression types that are really uncompressed: (kind, byte order)
+AIFC_ENCODINGS = {
+    b"NONE": ("i", ">"),
+    b"twos": ("i", ">"),
+    b"sowt": ("i", "<"),
+    b"fl32": ("f", ">"),
+    b"FL32": ("f", ">"),
+    b"fl64": ("f", ">"),
+    b"FL64": ("f", ">"),
+}
+
+
+def _iter_chunks(f, start: int, end: int, byte_order: str):
+    """Yield (chunk id, data offset, data size) for IFF-style chunks."""
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        chunk_id, size = struct.unpack(f"{byte_order}4sI", f.read(8))
+        yield chunk_id, offset + 8, size
+        # Chunks are padded to an even length
+        offset += 8 + size + (size & 1)
+
+
+def _widen_24(raw: np.ndarray, byte_order: str) -> np.ndarray:
+    """int32 samples from packed 24-bit ones (a trailing axis of 3 bytes)."""
+    widened = np.zeros(raw.shape[:-1] + (4,), dtype=np.uint8)
+    if byte_order == "<":
+        widened[..., 1:] = raw
+    else:
+        widened[..., :3] = raw
+    return widened.view(f"{byte_order}i4")[..., 0].astype(np.int32, copy=False)
+
+
+class _ConvertedSamples:
+    """(frames, channels) samples that are converted to a native dtype when sliced.
+
+    Wraps the raw memory map of a layout numpy can't use in place (24-bit,
+    big-endian), so converting it costs memory in proportion to the rows
+    asked for rather than to the file: waveform_samples streams it block
+    by block like any other map. Anything that needs a real array (numpy
+    functions, astype) gets the whole file converted.
+    """
+
+    ndim = 2
+
+    def __init__(self, raw: np.ndarray, dtype: np.dtype, convert):
+        self._raw = raw
+        self._convert = convert
+        self.dtype = np.dtype(dtype)
+        self.shape = raw.shape[:2]
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self._convert(self._raw[key])
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        samples = self[:]
+        return samples if dtype is None else samples.astype(dtype)
+
+    def astype(self, dtype, copy=True) -> np.ndarray:
+        return self[:].astype(dtype)
+
+
+def _map_samples(path: Path, offset: int, size: int, channels: int,
+                 sample_bytes: int, kind: str, byte_order: str) -> np.ndarray | _ConvertedSamples:
+    """(frames, channels) native-dtype samples for a raw PCM/float block.
+
+    The block is memory-mapped, so 8-bit and little-endian 16/32/64-bit
+    data (almost every WAV) is handed back as a view of the file with
+    nothing read up front. Other layouts are wrapped in _ConvertedSamples
+    and converted only as they're sliced: big-endian samples are
+    byte-swapped, and 24-bit samples are widened to int32 with the low
+    byte zeroed, the same full-scale int32 that pydub produces for 24-bit
+    audio.
+    """
+    frame_bytes = channels * sample_bytes
+    # Writers that never patched the header (or were killed mid-write) can
+    # leave a size running past the end of the file
+    frames = min(size, os.path.getsize(path) - offset) // frame_bytes
+    if frames <= 0:
+        dtype = np.int32 if sample_bytes == 3 else np.dtype(f"{kind}{sample_bytes}")
+        return np.zeros((0, channels), dtype=dtype)
+
+    if sample_bytes == 3:
+        raw = np.memmap(path, np.uint8, "r", offset, (frames, channels, 3))
+        return _ConvertedSamples(raw, np.int32, lambda rows: _widen_24(rows, byte_order))
+
+    if sample_bytes == 1:
+        # WAV stores 8-bit audio unsigned, AIFF signed
+        dtype = np.dtype(np.uint8 if byte_order == "<" else np.int8)
+    else:
+        dtype = np.dtype(f"{byte_order}{kind}{sample_bytes}")
+    samples = np.memmap(path, dtype, "r", offset, (frames, channels))
+    if not dtype.isnative:
+        native = dtype.newbyteorder("=")
+        return _ConvertedSamples(samples, native, lambda rows: rows.astype(native))
+    return samples
+
+
+def _read_wav(path: Path) -> DecodedAudio:
+    """Decode a RIFF WAVE file: PCM 8/16/24/32-bit or IEEE float.
+
+    Handles WAVE_FORMAT_EXTENSIBLE (multichannel and >16-bit files written
+    by most DAWs) by reading the real format from its sub-format GUID.
+    """
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"{path.name} is not a RIFF WAVE file")
+
+        fmt = data = None
+        for chunk_id, offset, size in _iter_chunks(f, 12, os.path.getsize(path), "<"):
+            if chunk_id == b"fmt ":
+                f.seek(offset)
+                fmt = f.read(size)
+            elif chunk_id == b"data":
+                data = (offset, size)
+                break
+
+    if fmt is None or data is None:
+        raise ValueError(f"{path.name} has no fmt or data chunk")
+
+    format_tag, channels, rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        # The sub-format GUID starts with the actual format tag
+        format_tag = struct.unpack("<H", fmt[24:26])[0]
+    if format_tag == WAVE_FORMAT_PCM:
+        kind = "i"
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        kind = "f"
+    else:
+        raise UnsupportedEncoding(f"WAV format 0x{format_tag:04x}")
+
+    if channels == 0:
+        raise ValueError(f"{path.name} has no channels")
+    # Samples occupy whole bytes; e.g. 20-bit audio sits in 3-byte containers
+    sample_bytes = block_align // channels or (bits + 7) // 8
+    if sample_bytes not in SAMPLE_BYTES[kind]:
+        raise UnsupportedEncoding(f"{sample_bytes}-byte {'float' if kind == 'f' else 'PCM'} WAV samples")
+
+    samples = _map_samples(path, *data, channels, sample_bytes, kind, "<")
+    return DecodedAudio(samples, rate)
+
+
+def _read_extended(raw: bytes) -> float:
+    """Decode an 80-bit IEEE extended float (the AIFF sample rate field)."""
+    exponent, mantissa = struct.unpack(">HQ", raw)
+    sign = -1 if exponent & 0x8000 else 1
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+
+def _read_aiff(path: Path) -> DecodedAudio:
+    """Decode an AIFF or uncompressed AIFF-C file."""
+    with open(path, "rb") as f:
+        form, _, form_type = struct.unpack(">4sI4s", f.read(12))
+        if form != b"FORM" or form_type not in (b"AIFF", b"AIFC"):
+            raise ValueError(f"{path.name} is not an AIFF file")
+
+        comm = data = None
+        for chunk_id, offset, size in _iter_chunks(f, 12, os.path.getsize(path), ">"):
+            if chunk_id == b"COMM":
+                f.seek(offset)
+                comm = f.read(size)
+            elif chunk_id == b"SSND":
+                f.seek(offset)
+                # Sample data starts after an offset/block-size header
+                data_offset, _ = struct.unpack(">II", f.read(8))
+                data = (offset + 8 + data_offset, size - 8 - data_offset)
+
+    if comm is None or data is None:
+        raise ValueError(f"{path.name} has no COMM or SSND chunk")
+
+    channels, frames, bits = struct.unpack(">hIh", comm[:8])
+    rate = _read_extended(comm[8:18])
+    kind, byte_order = "i", ">"
+    if form_type == b"AIFC":
+        compression = comm[18:22]
+        if compression not in AIFC_ENCODINGS:
+            raise UnsupportedEncoding(f"AIFF-C compression {compression!r}")
+        kind, byte_order = AIFC_ENCODINGS[compression]
+
+    if channels <= 0:
+        raise ValueError(f"{path.name} has no channels")
+    sample_bytes = (bits + 7) // 8
+    if sample_bytes not in SAMPLE_BYTES[kind]:
+        raise UnsupportedEncoding(f"{bits}-bit {'float' if kind == 'f' else 'PCM'} AIFF samples")
+
+    # COMM's frame count is authoritative; SSND may carry trailing padding
+    offset, size = data
+    size = min(size, frames * channels * sample_bytes)
+    samples = _map_samples(path, offset, size, channels, sample_bytes, kind, byte_order)
+    return DecodedAudio(samples, round(rate))
+
+
+NATIVE_READERS = {
+    ".wav": _read_wav,
+    ".wave": _read_wav,
+    ".aif": _read_aiff,
+    ".aiff": _read_aiff,
+    ".aifc": _read_aiff,
+}
+
+
+def load_audio(audio_path) -> DecodedAudio:
+    """Decode an audio file to native-dtype samples.
+
+    WAV and AIFF are read in-process from a memory map. Compressed formats,
+    and the rare WAV/AIFF-C with a compressed encoding, fall back to pydub
+    (which runs ffmpeg).
+    """
+    path = Path(audio_path)
+    reader = NATIVE_READERS.get(path.suffix.lower())
+    if reader is not None:
+        try:
+            return reader(path)
+        except UnsupportedEncoding:
+            pass
+
+    from pydub import AudioSegment
+    audio = AudioSegment.from_file(str(path))
+    # array typecodes b/h/i map to int8/int16/int32
+    data = np.array(audio.get_array_of_samples())
+    return DecodedAudio(data.reshape(-1, audio.channels), audio.frame_rate)
+
+
+def to_float_mono(audio: DecodedAudio) -> np.ndarray:
+    """Mono float32 samples normalized to [-1, 1]."""
+    data = audio.samples
+    arr = data.astype(np.float32)
+    # Normalize integer formats to [-1, 1]
+    if data.dtype == np.int8:
+        arr /= 128.0
+    elif data.dtype == np.int16:
+        arr /= 32768.0
+    elif data.dtype == np.int32:
+        arr /= 2147483648.0
+    elif data.dtype == np.uint8:
+        arr = (arr - 128.0) / 128.0
+    # float32/float64 WAVs are already in [-1, 1]
+
+    # Mix stereo (or multi-channel) down to mono by averaging channels
+    if arr.shape[1] > 1:
+        return arr.mean(axis=1)
+    return arr[:, 0]
+
+
+def ms_to_frame(audio: DecodedAudio, ms: float) -> int:
+    """Frame index for a millisecond position, as AudioSegment slicing does."""
+    return int(min(ms, audio.duration_ms) * audio.frame_rate / 1000.0)
+
+
+def slice_ms(audio: DecodedAudio, start_ms: float, end_ms: float) -> DecodedAudio:
+    """The [start_ms, end_ms) span of audio — a view, no samples copied.
+
+    Frame boundaries match AudioSegment[start_ms:end_ms], so a slice holds
+    the samples pydub would have exported for that span (except that pydub
+    pads a slice running past the last frame with silence; this one just
+    ends there). 24-bit and big-endian audio convert just the span.
+    """
+    start = ms_to_frame(audio, start_ms)
+    end = ms_to_frame(audio, end_ms)
+    return DecodedAudio(audio.samples[start:end], audio.frame_rate)
+
+
+def write_wav(path, audio: DecodedAudio):
+    """Write samples to a WAV file atomically, straight from the buffer.
+
+    scipy writes the array's memory directly, so a slice of a larger
+    buffer goes to disk without being copied first (only int8, which WAV
+    can't store, is converted to unsigned 8-bit). The data lands in a
+    temporary file next to path and is renamed into place, so a crash
+    never leaves a truncated WAV behind.
+    """
+    path = Path(path)
+    samples = np.asarray(audio.samples)
+    if samples.dtype == np.int8:
+        samples = (samples.astype(np.int16) + 128).astype(np.uint8)
+    if samples.shape[1] == 1:
+        samples = samples[:, 0]
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        wavfile.write(tmp_path, audio.frame_rate, samples)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""Benchmark the asset pipelines on synthetic, reproducible inputs.
+
+Generates a corpus of animated line-art GIFs and multi-event sound files
+(deterministic: the same parameters always give the same bytes), runs
+the butt and sound pipeline stages over it at one or more scales, and
+writes per-stage timings, throughput and peak memory to JSON. Given a
+previous result as a baseline, flags anything that got slower or
+hungrier by more than a threshold.
+
+Usage:
+    cd scripts/
+    uv run bench-press.py                          # 47 GIFs + 20 sounds
+    uv run bench-press.py --gifs 47 500 2000       # scale the GIF run up
+    uv run bench-press.py --sounds 20 200 --sound-seconds 30 --channels 1
+    uv run bench-press.py --output baseline.json   # keep as a baseline
+    uv run bench-press.py --compare baseline.json  # exit 1 on regressions
+
+Each scale runs in a fresh process, so its peak RSS is its own.
+"""
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+from PIL import Image, ImageDraw
+from scipy.io import wavfile
+
+import profiling
+from audio_decode import load_audio
+from png_encoding import DEFAULT_PRESET, PRESETS, encode_png
+from profiling import stage
+from shuffle_segments import split_segments
+from waveform_samples import analyze
+
+# -- Configuration ----------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CORPUS_DIR = SCRIPT_DIR / ".bench-corpus"
+RESULTS_PATH = SCRIPT_DIR / ".bench-results.json"
+
+# Corpus defaults: the shipped GIFs are 512x512, the shipped sounds short
+GIF_SIZE = 512
+GIF_FRAMES = 12
+GIF_DELAY = 100
+SOUND_SECONDS = 5.0
+SOUND_CHANNELS = 2
+SOUND_EVENTS = 4
+SOUND_RATE = 44100
+WAVEFORM_BARS = 25  # as in sound-check.py
+
+# Shapes drawn per GIF, and how far (as a fraction of the size) they drift
+GIF_SHAPES = 8
+GIF_DRIFT = 0.08
+# Gaps between sound events must be clearly longer than split_segments'
+# min_silence_len (200 ms) to split there
+MIN_GAP_SECONDS = 0.3
+NOISE_FLOOR = 1e-4  # -80 dBFS, well under split_segments' -40 dBFS threshold
+
+DEFAULT_THRESHOLD = 0.10
+# Timings shorter than this are mostly noise and never count as regressions
+MIN_COMPARE_SECONDS = 0.05
+
+
+# -- Synthetic corpus ---------------------------------------------------------
+
+def make_gif(path: Path, size: int, frames: int, seed: int):
+    """Write an animated GIF of black line art drifting on white."""
+    rng = random.Random(seed)
+    width = max(2, size // 128)
+    shapes = []
+    for _ in range(GIF_SHAPES):
+        x0, y0 = rng.uniform(0.1, 0.7) * size, rng.uniform(0.1, 0.7) * size
+        w, h = rng.uniform(0.1, 0.3) * size, rng.uniform(0.1, 0.3) * size
+        shapes.append({
+            "kind": rng.choice(("ellipse", "line", "arc")),
+            "box": (x0, y0, x0 + w, y0 + h),
+            "drift": (rng.uniform(-1, 1) * GIF_DRIFT * size, rng.uniform(-1, 1) * GIF_DRIFT * size),
+            "phase": rng.uniform(0, 360),
+        })
+
+    images = []
+    for i in range(frames):
+        t = i / max(1, frames - 1)
+        image = Image.new("L", (size, size), 255)
+        draw = ImageDraw.Draw(image)
+        for shape in shapes:
+            dx, dy = shape["drift"][0] * t, shape["drift"][1] * t
+            left, top, right, bottom = shape["box"]
+            box = (left + dx, top + dy, right + dx, bottom + dy)
+            if shape["kind"] == "ellipse":
+                draw.ellipse(box, outline=0, width=width)
+            elif shape["kind"] == "line":
+                draw.line(box, fill=0, width=width)
+            else:
+                start = shape["phase"] + 90 * t
+                draw.arc(box, start, start + 200, fill=0, width=width)
+        images.append(image)
+    images[0].save(path, save_all=True, append_images=images[1:], duration=GIF_DELAY, loop=0)
+
+
+def make_sound(seconds: float, channels: int, events: int, seed: int) -> np.ndarray:
+    """(frames, channels) int16 audio: events separated by near-silence.
+
+    Each event is a short decaying burst (a low tone plus noise) placed in
+    its own equal slot, so consecutive events are at least one gap apart.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SOUND_RATE)
+    audio = rng.normal(0, NOISE_FLOOR, (total, channels))
+
+    slot = total // max(1, events)
+    gap = int(MIN_GAP_SECONDS * SOUND_RATE)
+    if events and slot <= gap:
+        raise ValueError(f"{events} events don't fit in {seconds}s with "
+                         f"{MIN_GAP_SECONDS}s gaps between them")
+    for i in range(events):
+        length = int(rng.uniform(0.4, 0.8) * (slot - gap))
+        start = i * slot + (slot - length) // 2
+        t = np.arange(length) / SOUND_RATE
+        envelope = np.exp(-t * rng.uniform(4, 12)) * np.minimum(1, t / 0.005)
+        tone = np.sin(2 * np.pi * rng.uniform(60, 200) * t)
+        burst = (0.6 * tone + 0.4 * rng.uniform(-1, 1, length)) * envelope * rng.uniform(0.3, 0.9)
+        audio[start:start + length] += burst[:, None] * rng.uniform(0.7, 1.0, channels)
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+
+def gif_corpus(corpus_dir: Path, count: int, size: int, frames: int) -> list[Path]:
+    """The first count GIFs of the corpus for these parameters, generating any missing.
+
+    GIF i is always generated from seed i, so a larger scale reuses (and
+    extends) the files of a smaller one.
+    """
+    folder = corpus_dir / f"gifs-{size}px-{frames}f"
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = [folder / f"bench-butt-{i:04d}.gif" for i in range(count)]
+    for i, path in enumerate(paths):
+        if not path.exists():
+            make_gif(path, size, frames, seed=i)
+    return paths
+
+
+def sound_corpus(corpus_dir: Path, count: int, seconds: float, channels: int,
+                 events: int, fmt: str) -> list[Path]:
+    """The first count sounds of the corpus for these parameters, generating any missing."""
+    folder = corpus_dir / f"sounds-{seconds:g}s-{channels}ch-{events}ev-{fmt}"
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = [folder / f"bench-sound-{i:04d}.{fmt}" for i in range(count)]
+    for i, path in enumerate(paths):
+        if path.exists():
+            continue
+        samples = make_sound(seconds, channels, events, seed=i)
+        if fmt == "wav":
+            wavfile.write(path, SOUND_RATE, samples)
+        else:
+            from pydub import AudioSegment
+            AudioSegment(
+                samples.tobytes(), frame_rate=SOUND_RATE, sample_width=2, channels=channels,
+            ).export(path, format=fmt)
+    return paths
+
+
+def has_ffmpeg() -> bool:
+    """Check if ffmpeg is available (needed to write and read MP3s)."""
+    try:
+        subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
+        return True
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return False
+
+
+# -- Benchmark runs -----------------------------------------------------------
+
+def load_script(filename: str):
+    """Import one of the hyphen-named pipeline scripts as a module."""
+    spec = importlib.util.spec_from_file_location(Path(filename).stem.replace("-", "_"),
+                                                  SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_gifs(paths: list[Path], preset: str) -> dict:
+    """Run the butt pipeline over paths, encoding PNGs in memory.
+
+    The stages are brazilian-butt-lift.py's own (decode, composite,
+    grayscale, filter, resize, alpha, ...) with its default options.
+    Encoded PNGs are counted but not written, so disk speed stays out of it.
+    """
+    butt_lift = load_script("brazilian-butt-lift.py")
+    options = {"format": "frames", "dedup": None, "png": preset, "variants": False, "trim": None}
+    totals = {"frames": 0, "pngBytes": 0}
+
+    def emit(filename, image, untrimmed):
+        with stage("encode"):
+            totals["pngBytes"] += len(encode_png(image, preset))
+
+    for path in paths:
+        with profiling.asset(path.name):
+            fields = butt_lift.render_outputs(butt_lift.iter_frames(path), options, emit)
+        totals["frames"] += fields["frameCount"]
+    return totals
+
+
+def bench_sounds(paths: list[Path]) -> dict:
+    """Run each sound through sound-check.py's shuffle-source stages.
+
+    That is the longest path a sound takes: decode, waveform, split at
+    silence into segment WAVs (in a scratch folder), and a waveform per
+    segment.
+    """
+    totals = {"audioSeconds": 0.0, "segments": 0}
+    with TemporaryDirectory() as scratch:
+        for path in paths:
+            with profiling.asset(path.name):
+                with stage("decode"):
+                    audio = load_audio(path)
+                with stage("waveform"):
+                    analyze(audio, WAVEFORM_BARS)
+                with stage("split"):
+                    segments = split_segments(audio, scratch, path.stem)
+                with stage("waveform"):
+                    for _, segment in segments:
+                        analyze(segment, WAVEFORM_BARS)
+            totals["audioSeconds"] += len(audio.samples) / audio.frame_rate
+            totals["segments"] += len(segments)
+    return totals
+
+
+def run_bench(kind: str, paths: list[Path], preset: str) -> dict:
+    """Pool worker: one scale of one pipeline, timed stage by stage."""
+    profiling.enable()
+    started = time.perf_counter()
+    totals = bench_gifs(paths, preset) if kind == "gifs" else bench_sounds(paths)
+    elapsed = time.perf_counter() - started
+
+    throughput = {"items/s": len(paths) / elapsed}
+    if kind == "gifs":
+        throughput["frames/s"] = totals["frames"] / elapsed
+    else:
+        throughput["audio s/s"] = totals["audioSeconds"] / elapsed
+    return {
+        "kind": kind,
+        "items": len(paths),
+        "elapsed": elapsed,
+        "peakRssMB": profiling.peak_rss_mb(),
+        "throughput": throughput,
+        "totals": totals,
+        "stages": profiling.stage_totals(profiling.take_records()),
+    }
+
+
+def run_isolated(kind: str, paths: list[Path], preset: str) -> dict:
+    """run_bench in a freshly spawned process, so peak RSS covers just this run."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_bench, kind, paths, preset).result()
+
+
+# -- Reporting ----------------------------------------------------------------
+
+def rounded(value):
+    """value with every float rounded to 4 places, for stable JSON."""
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, dict):
+        return {k: rounded(v) for k, v in value.items()}
+    return value
+
+
+def print_run(name: str, run: dict):
+    rates = ", ".join(f"{v:.1f} {k}" for k, v in run["throughput"].items())
+    print(f"\n{name}: {run['elapsed']:.2f}s, peak RSS {run['peakRssMB']:.0f} MB ({rates})")
+    for stage_name, total in run["stages"].items():
+        print(f"  {stage_name:14s} {total['wall']:8.2f}s  {total['calls']:7d} calls")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every timing or peak RSS more than threshold above the baseline.
+
+    Runs are matched by name (e.g. "gifs@47"), so only scales present in
+    both are compared. Times below MIN_COMPARE_SECONDS are skipped.
+    """
+    if results["corpus"] != baseline.get("corpus"):
+        print("Warning: baseline used a different corpus; timings may not be comparable",
+              file=sys.stderr)
+
+    regressions = []
+
+    def check(label: str, new: float, old: float, unit: str, floor: float):
+        if old < floor:
+            return
+        change = new / old - 1
+        flag = "  <-- REGRESSION" if change > threshold else ""
+        print(f"  {label:30s} {old:9.2f} -> {new:9.2f} {unit:2s} {change:+7.1%}{flag}")
+        if flag:
+            regressions.append(f"{label}: {old:.2f} -> {new:.2f} {unit} ({change:+.1%})")
+
+    print(f"\nCompared with baseline (threshold {threshold:.0%}):")
+    for name, run in results["runs"].items():
+        old = baseline["runs"].get(name)
+        if old is None:
+            continue
+        check(f"{name} total", run["elapsed"], old["elapsed"], "s", MIN_COMPARE_SECONDS)
+        check(f"{name} peak RSS", run["peakRssMB"], old["peakRssMB"], "MB", 0)
+        for stage_name, total in run["stages"].items():
+            if stage_name in old["stages"]:
+                check(f"{name} {stage_name}", total["wall"], old["stages"][stage_name]["wall"],
+                      "s", MIN_COMPARE_SECONDS)
+    return regressions
+
+
+# -- Main -------------------------------------------------------------------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the asset pipelines on synthetic inputs.")
+    parser.add_argument(
+        "--gifs", type=int, nargs="*", default=[47], metavar="N",
+        help="GIF counts to benchmark the butt pipeline at (default: 47; none to skip)",
+    )
+    parser.add_argument(
+        "--sounds", type=int, nargs="*", default=[20], metavar="N",
+        help="sound counts to benchmark the sound pipeline at (default: 20; none to skip)",
+    )
+    parser.add_argument("--gif-size", type=int, default=GIF_SIZE, help=f"GIF width and height (default: {GIF_SIZE})")
+    parser.add_argument("--gif-frames", type=int, default=GIF_FRAMES, help=f"frames per GIF (default: {GIF_FRAMES})")
+    parser.add_argument(
+        "--sound-seconds", type=float, default=SOUND_SECONDS,
+        help=f"length of each sound (default: {SOUND_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--channels", type=int, default=SOUND_CHANNELS, help=f"channels per sound (default: {SOUND_CHANNELS})",
+    )
+    parser.add_argument(
+        "--events", type=int, default=SOUND_EVENTS,
+        help=f"silence-separated events per sound (default: {SOUND_EVENTS})",
+    )
+    parser.add_argument(
+        "--sound-format", choices=("wav", "mp3"), default="wav",
+        help="file format of the sounds (mp3 needs ffmpeg; default: wav)",
+    )
+    parser.add_argument(
+        "--png", choices=sorted(PRESETS), default=DEFAULT_PRESET,
+        help=f"PNG encoding preset (default: {DEFAULT_PRESET})",
+    )
+    parser.add_argument(
+        "--corpus", type=Path, default=CORPUS_DIR,
+        help=f"where generated inputs are kept and reused (default: {CORPUS_DIR.name})",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=RESULTS_PATH, metavar="JSON",
+        help=f"where to write the results (default: {RESULTS_PATH.name})",
+    )
+    parser.add_argument(
+        "--compare", type=Path, default=None, metavar="BASELINE",
+        help="compare against an earlier results file and exit 1 on regressions",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"fractional slowdown counted as a regression (default: {DEFAULT_THRESHOLD})",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.sounds and args.sound_format == "mp3" and not has_ffmpeg():
+        print("ffmpeg not found — needed for --sound-format mp3 (brew install ffmpeg)", file=sys.stderr)
+        sys.exit(1)
+
+    corpus = {
+        "gif": {"size": args.gif_size, "frames": args.gif_frames},
+        "sound": {"seconds": args.sound_seconds, "channels": args.channels,
+                  "events": args.events, "format": args.sound_format},
+        "png": args.png,
+    }
+    runs = {}
+    for count in sorted(args.gifs):
+        print(f"Preparing {count} GIFs ({args.gif_size}px, {args.gif_frames} frames)...")
+        paths = gif_corpus(args.corpus, count, args.gif_size, args.gif_frames)
+        runs[f"gifs@{count}"] = run_isolated("gifs", paths, args.png)
+        print_run(f"gifs@{count}", runs[f"gifs@{count}"])
+    for count in sorted(args.sounds):
+        print(f"\nPreparing {count} sounds ({args.sound_seconds:g}s, {args.channels} ch, "
+              f"{args.events} events, {args.sound_format})...")
+        paths = sound_corpus(args.corpus, count, args.sound_seconds, args.channels,
+                             args.events, args.sound_format)
+        runs[f"sounds@{count}"] = run_isolated("sounds", paths, args.png)
+        print_run(f"sounds@{count}", runs[f"sounds@{count}"])
+
+    results = {
+        "script": Path(sys.argv[0]).name,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "cpus": os.cpu_count()},
+        "corpus": corpus,
+        "runs": rounded(runs),
+    }
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""Compact binary forms of the butt and sound manifests.
+
+Used by brazilian-butt-lift.py and sound-check.py, which write
+ButtFrames/manifest.bin and sounds/sounds-manifest.bin next to the JSON
+manifests, and by verify-manifests.py. The app memory-maps the .bin and
+reads entries straight out of it (ManifestReader in BinaryManifest.swift),
+so launch does no JSON tokenizing or float parsing.
+
+Layout (all integers little-endian, every section 4-byte aligned):
+
+  Header, 32 bytes
+     0  magic        4s   b"PBTM" (butts) or b"PSND" (sounds)
+     4  version      u16  FORMAT_VERSION
+     6  record_size  u16  bytes per entry record
+     8  count        u32  number of entries
+    12  strings      u32  offset of the string table
+    16  strings_size u32
+    20  data         u32  offset of the data section
+    24  data_size    u32
+    28  reserved     u32
+  Records   count fixed-size records, starting at byte 32
+  Strings   UTF-8, each distinct string stored once; referenced by
+            (offset, length) u32 pairs relative to the table
+  Data      variable-length arrays, referenced by offset relative to the
+            section: u16 frame delays, u16 (x, y, w, h) rects,
+            waveforms as u8 (bar = byte / 255) and waveform pyramids
+
+Butt record, 36 bytes: id, name (string refs); frameCount u16; flags u16
+(ATLAS, TRIM, VARIANTS); data offsets of the frame delays, atlas rects,
+trim (u16 w, h + rects) and variants (u16 mode count, u16 strip count,
+mode string refs, u16 (size, y) strips).
+
+Sound record, 68 bytes: id, name, category, file, ext, source (string
+refs); flags u16; waveform bar count u16; waveform offset u32; segment
+count u16; reserved u16; segments offset u32; pyramid offset u32. A
+segment is 28 bytes in the data section: file, ext (string refs),
+waveform offset u32, bar count u16, flags u16, pyramid offset u32.
+
+A pyramid is u16 level count, u16 bars per level, then every level's RMS
+bytes and every level's peak bytes (finest level first), the same bytes
+the manifest's base64 "rms" and "peak" strings hold.
+
+Waveform bars are 2-decimal values in [0, 1], and round(byte / 255, 2)
+gives every such value back exactly, so the quantization is lossless.
+Only the fields the app reads are carried (frameMap, for one, isn't).
+"""
+
+import base64
+import struct
+from pathlib import Path
+
+FORMAT_VERSION = 2
+BUTTS_MAGIC = b"PBTM"
+SOUNDS_MAGIC = b"PSND"
+
+HEADER = struct.Struct("<4sHHIIIIII")
+BUTT_RECORD = struct.Struct("<IIIIHHIIII")
+SOUND_RECORD = struct.Struct("<IIIIIIIIIIIIHHIHHII")
+SEGMENT = struct.Struct("<IIIIIHHI")
+
+# Butt record flags
+ATLAS = 1
+TRIM = 2
+VARIANTS = 4
+
+# Sound record flags (HAS_WAVEFORM and HAS_PYRAMID are also segment flags)
+HAS_FILE = 1
+HAS_EXT = 2
+HAS_SOURCE = 4
+HAS_WAVEFORM = 8
+HAS_SEGMENTS = 16
+HAS_SHUFFLE = 32
+SHUFFLE = 64
+HAS_PYRAMID = 128
+
+WAVEFORM_DECIMALS = 2
+
+# The manifest fields a .bin carries, for comparing against the JSON
+BUTT_FIELDS = ("id", "name", "frameCount", "frameDelays", "atlas", "trim", "variants")
+SOUND_FIELDS = (
+    "id", "name", "category", "file", "ext", "shuffle", "source", "waveform", "pyramid", "segments",
+)
+SEGMENT_FIELDS = ("file", "ext", "waveform", "pyramid")
+
+
+class _Builder:
+    """Accumulates the string table and data section while records are packed."""
+
+    def __init__(self):
+        self.strings = bytearray()
+        self.string_refs: dict[str, tuple[int, int]] = {}
+        self.data = bytearray()
+
+    def string(self, value: str | None) -> tuple[int, int]:
+        if value is None:
+            return 0, 0
+        if value not in self.string_refs:
+            encoded = value.encode()
+            self.string_refs[value] = (len(self.strings), len(encoded))
+            self.strings += encoded
+        return self.string_refs[value]
+
+    def blob(self, data: bytes) -> int:
+        """Append data 4-byte aligned and return its offset."""
+        self.data += bytes(-len(self.data) % 4)
+        offset = len(self.data)
+        self.data += data
+        return offset
+
+    def pack(self, magic: bytes, record_size: int, records: list[bytes]) -> bytes:
+        strings = bytes(self.strings) + bytes(-len(self.strings) % 4)
+        strings_offset = HEADER.size + record_size * len(records)
+        data_offset = strings_offset + len(strings)
+        header = HEADER.pack(magic, FORMAT_VERSION, record_size, len(records),
+                             strings_offset, len(self.strings), data_offset, len(self.data), 0)
+        return header + b"".join(records) + strings + bytes(self.data)
+
+
+def _u16s(values: list[int], what: str) -> bytes:
+    if any(not 0 <= v <= 0xFFFF for v in values):
+        raise ValueError(f"{what} out of u16 range: {values}")
+    return struct.pack(f"<{len(values)}H", *values)
+
+
+def _rects(rects: list[dict], what: str) -> bytes:
+    return _u16s([r[k] for r in rects for k in ("x", "y", "w", "h")], what)
+
+
+def quantize(waveform: list[float]) -> bytes:
+    """One byte per bar: round(bar * 255), clamped to [0, 255]."""
+    return bytes(min(255, max(0, round(v * 255))) for v in waveform)
+
+
+def dequantize(data: bytes) -> list[float]:
+    return [round(b / 255, WAVEFORM_DECIMALS) for b in data]
+
+
+def _pyramid(pyramid: dict, what: str) -> bytes:
+    bars = pyramid["bars"]
+    rms, peak = base64.b64decode(pyramid["rms"]), base64.b64decode(pyramid["peak"])
+    if not len(rms) == len(peak) == sum(bars):
+        raise ValueError(f"{what}: pyramid has {len(rms)} RMS and {len(peak)} peak "
+                         f"bytes for {sum(bars)} bars")
+    return _u16s([len(bars), *bars], f"{what} pyramid levels") + rms + peak
+
+
+def encode_butts(butts: list[dict]) -> bytes:
+    """The .bin form of ButtFrames/manifest.json's "butts" list."""
+    builder = _Builder()
+    records = []
+    for butt in butts:
+        count = butt["frameCount"]
+        what = butt["id"]
+        if len(butt["frameDelays"]) != count:
+            raise ValueError(f"{what}: {len(butt['frameDelays'])} delays for {count} frames")
+        flags = atlas = trim = variants = 0
+        delays = builder.blob(_u16s(butt["frameDelays"], f"{what} frame delays"))
+        if "atlas" in butt:
+            flags |= ATLAS
+            atlas = builder.blob(_rects(butt["atlas"]["frames"], f"{what} atlas rects"))
+        if "trim" in butt:
+            flags |= TRIM
+            t = butt["trim"]
+            trim = builder.blob(_u16s([t["w"], t["h"]], f"{what} trim size")
+                                + _rects(t["frames"], f"{what} trim rects"))
+        if "variants" in butt:
+            flags |= VARIANTS
+            v = butt["variants"]
+            modes = b"".join(struct.pack("<II", *builder.string(m)) for m in v["modes"])
+            strips = _u16s([s[k] for s in v["strips"] for k in ("size", "y")], f"{what} strips")
+            variants = builder.blob(_u16s([len(v["modes"]), len(v["strips"])], f"{what} variants")
+                                    + modes + strips)
+        records.append(BUTT_RECORD.pack(
+            *builder.string(butt["id"]), *builder.string(butt["name"]),
+            count, flags, delays, atlas, trim, variants,
+        ))
+    return builder.pack(BUTTS_MAGIC, BUTT_RECORD.size, records)
+
+
+def encode_sounds(sounds: list[dict]) -> bytes:
+    """The .bin form of sounds/sounds-manifest.json."""
+    builder = _Builder()
+    records = []
+    for sound in sounds:
+        flags = waveform = pyramid = segments = 0
+        for key, flag in (("file", HAS_FILE), ("ext", HAS_EXT), ("source", HAS_SOURCE)):
+            if sound.get(key) is not None:
+                flags |= flag
+        if "shuffle" in sound:
+            flags |= HAS_SHUFFLE | (SHUFFLE if sound["shuffle"] else 0)
+        bars = sound.get("waveform")
+        if bars is not None:
+            flags |= HAS_WAVEFORM
+            waveform = builder.blob(quantize(bars))
+        if sound.get("pyramid") is not None:
+            flags |= HAS_PYRAMID
+            pyramid = builder.blob(_pyramid(sound["pyramid"], sound["id"]))
+        segment_list = sound.get("segments")
+        if segment_list is not None:
+            flags |= HAS_SEGMENTS
+            packed = []
+            for seg in segment_list:
+                seg_bars = seg.get("waveform")
+                seg_flags = seg_waveform = seg_pyramid = 0
+                if seg_bars is not None:
+                    seg_flags |= HAS_WAVEFORM
+                    seg_waveform = builder.blob(quantize(seg_bars))
+                if seg.get("pyramid") is not None:
+                    seg_flags |= HAS_PYRAMID
+                    seg_pyramid = builder.blob(_pyramid(seg["pyramid"], f"{sound['id']} {seg['file']}"))
+                packed.append(SEGMENT.pack(
+                    *builder.string(seg["file"]), *builder.string(seg["ext"]),
+                    seg_waveform, len(seg_bars or []), seg_flags, seg_pyramid,
+                ))
+            segments = builder.blob(b"".join(packed))
+        records.append(SOUND_RECORD.pack(
+            *builder.string(sound["id"]), *builder.string(sound["name"]),
+            *builder.string(sound["category"]), *builder.string(sound.get("file")),
+            *builder.string(sound.get("ext")), *builder.string(sound.get("source")),
+            flags, len(bars or []), waveform, len(segment_list or []), 0, segments, pyramid,
+        ))
+    return builder.pack(SOUNDS_MAGIC, SOUND_RECORD.size, records)
+
+
+def _sections(data: bytes, magic: bytes, record: struct.Struct):
+    """(records, strings, data section) views of a .bin, after checking its header."""
+    found, version, record_size, count, strings, strings_size, section, section_size, _ = (
+        HEADER.unpack_from(data))
+    if found != magic:
+        raise ValueError(f"not a {magic.decode()} manifest (magic {found!r})")
+    if version != FORMAT_VERSION or record_size != record.size:
+        raise ValueError(f"unsupported manifest version {version} (record size {record_size})")
+    if section + section_size > len(data):
+        raise ValueError("manifest is truncated")
+    view = memoryview(data)
+    records = [record.unpack_from(data, HEADER.size + i * record.size) for i in range(count)]
+    return records, view[strings:strings + strings_size], view[section:section + section_size]
+
+
+def _u16_list(section, offset: int, count: int) -> list[int]:
+    return list(struct.unpack_from(f"<{count}H", section, offset))
+
+
+def _rect_list(section, offset: int, count: int) -> list[dict]:
+    values = _u16_list(section, offset, 4 * count)
+    return [dict(zip("xywh", values[i:i + 4])) for i in range(0, len(values), 4)]
+
+
+def _pyramid_dict(section, offset: int) -> dict:
+    (level_count,) = struct.unpack_from("<H", section, offset)
+    bars = _u16_list(section, offset + 2, level_count)
+    start = offset + 2 + 2 * level_count
+    total = sum(bars)
+    return {
+        "bars": bars,
+        "rms": base64.b64encode(section[start:start + total]).decode(),
+        "peak": base64.b64encode(section[start + total:start + 2 * total]).decode(),
+    }
+
+
+def decode_butts(data: bytes) -> list[dict]:
+    """The butt entries of a manifest.bin, as JSON-shaped dicts."""
+    records, strings, section = _sections(data, BUTTS_MAGIC, BUTT_RECORD)
+
+    def text(offset, length):
+        return bytes(strings[offset:offset + length]).decode()
+
+    butts = []
+    for id_off, id_len, name_off, name_len, count, flags, delays, atlas, trim, variants in records:
+        butt = {"id": text(id_off, id_len), "name": text(name_off, name_len),
+                "frameCount": count, "frameDelays": _u16_list(section, delays, count)}
+        if flags & ATLAS:
+            butt["atlas"] = {"frames": _rect_list(section, atlas, count)}
+        if flags & TRIM:
+            w, h = _u16_list(section, trim, 2)
+            butt["trim"] = {"w": w, "h": h, "frames": _rect_list(section, trim + 4, count)}
+        if flags & VARIANTS:
+            mode_count, strip_count = _u16_list(section, variants, 2)
+            refs = struct.unpack_from(f"<{2 * mode_count}I", section, variants + 4)
+            strips = _u16_list(section, variants + 4 + 8 * mode_count, 2 * strip_count)
+            butt["variants"] = {
+                "modes": [text(refs[i], refs[i + 1]) for i in range(0, len(refs), 2)],
+                "strips": [{"size": strips[i], "y": strips[i + 1]} for i in range(0, len(strips), 2)],
+            }
+        butts.append(butt)
+    return butts
+
+
+def decode_sounds(data: bytes) -> list[dict]:
+    """The entries of a sounds-manifest.bin, as JSON-shaped dicts."""
+    records, strings, section = _sections(data, SOUNDS_MAGIC, SOUND_RECORD)
+
+    def text(offset, length):
+        return bytes(strings[offset:offset + length]).decode()
+
+    def bars(offset, count):
+        return dequantize(bytes(section[offset:offset + count]))
+
+    sounds = []
+    for record in records:
+        refs = record[:12]
+        flags, bar_count, waveform, segment_count, _, segments, pyramid = record[12:]
+        id_, name, category, file, ext, source = (
+            text(refs[i], refs[i + 1]) for i in range(0, 12, 2))
+        sound = {"id": id_, "name": name, "category": category}
+        if flags & HAS_FILE:
+            sound["file"] = file
+        if flags & HAS_EXT:
+            sound["ext"] = ext
+        if flags & HAS_SHUFFLE:
+            sound["shuffle"] = bool(flags & SHUFFLE)
+        if flags & HAS_SOURCE:
+            sound["source"] = source
+        if flags & HAS_WAVEFORM:
+            sound["waveform"] = bars(waveform, bar_count)
+        if flags & HAS_PYRAMID:
+            sound["pyramid"] = _pyramid_dict(section, pyramid)
+        if flags & HAS_SEGMENTS:
+            sound["segments"] = []
+            for i in range(segment_count):
+                f_off, f_len, e_off, e_len, seg_waveform, seg_bars, seg_flags, seg_pyramid = (
+                    SEGMENT.unpack_from(section, segments + i * SEGMENT.size))
+                seg = {"file": text(f_off, f_len), "ext": text(e_off, e_len)}
+                if seg_flags & HAS_WAVEFORM:
+                    seg["waveform"] = bars(seg_waveform, seg_bars)
+                if seg_flags & HAS_PYRAMID:
+                    seg["pyramid"] = _pyramid_dict(section, seg_pyramid)
+                sound["segments"].append(seg)
+        sounds.append(sound)
+    return sounds
+
+
+def carried(entry: dict, fields: tuple[str, ...]) -> dict:
+    """entry reduced to the fields a .bin carries, to compare with a decoded one."""
+    kept = {k: entry[k] for k in fields if k in entry}
+    if "segments" in kept:
+        kept["segments"] = [carried(seg, SEGMENT_FIELDS) for seg in kept["segments"]]
+    return kept
+
+
+def write_if_changed(path: Path, data: bytes):
+    """Write data to path unless it already holds exactly these bytes."""
+    if not (path.exists() and path.read_bytes() == data):
+        path.write_bytes(data)
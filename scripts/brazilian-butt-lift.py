@@ -14,23 +14,80 @@ Usage:
     source .venv/bin/activate
     pip install -r requirements.txt
     python3 brazilian-butt-lift.py
+    python3 brazilian-butt-lift.py --jobs 8   # spread GIFs across 8 processes
+    python3 brazilian-butt-lift.py --force    # ignore the build cache, rebuild all
+    python3 brazilian-butt-lift.py --atlas    # one sprite sheet per butt and line weight
+    python3 brazilian-butt-lift.py --check    # verify ButtFrames/ matches a fresh render
+    python3 brazilian-butt-lift.py --dedup    # merge identical consecutive frames
+    python3 brazilian-butt-lift.py --png smallest  # slowest encode, smallest PNGs
+    python3 brazilian-butt-lift.py --variants # pre-render display modes at menu/Touch Bar sizes
+    python3 brazilian-butt-lift.py --trim union  # crop transparent borders, record offsets
+    python3 brazilian-butt-lift.py --profile  # per-stage timing report + .butt-profile.json
+    python3 brazilian-butt-lift.py --watch    # keep running, rebuild each GIF as it's saved
+    python3 brazilian-butt-lift.py --frames-only    # frame folders only (see build-assets.py)
+    python3 brazilian-butt-lift.py --manifest-only  # manifest only, from the last builds
+
+Rebuilds are incremental: a cache file records a hash of each source GIF
+and the pipeline parameters, and only new or changed GIFs are reprocessed.
 """
 
+import argparse
+import hashlib
 import json
+import math
+import os
 import re
+import shutil
 import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
-from PIL import Image, ImageFilter, ImageOps
+import numpy as np
+from PIL import Image, ImageChops, ImageOps
+
+import profiling
+import watching
+from binary_manifest import encode_butts, write_if_changed
+from png_encoding import DEFAULT_PRESET, PRESETS, encode_png
+from profiling import stage
 
 # -- Configuration ----------------------------------------------------------
 
 FRAME_SIZE = (160, 160)
 RESAMPLE = Image.LANCZOS
+BOLD_FILTER_SIZE = 3
+# Frames processed together as one (frames, H, W) array. Bounds memory
+# while amortizing per-call overhead across the batch.
+BATCH_FRAMES = 16
+
+# Line weight -> (filename suffix, MinFilter size; 0 = lines as drawn).
+# Suffixes must match LineWeight.frameSuffix in Constants.swift.
+LINE_WEIGHTS = {
+    "regular": ("", 0),
+    "bold": ("_bold", BOLD_FILTER_SIZE),
+}
+
+# Pre-rendered variants (--variants): every display mode at the exact pixel
+# sizes the app shows butts at — menu bar IconSize points and the Touch Bar
+# parade, each @1x and @2x. Must match DisplayMode, IconSize.points and
+# Layout.touchBarButtSize in Constants.swift.
+DISPLAY_MODES = ("stencil", "outline", "original")
+VARIANT_POINT_SIZES = (20, 21, 22, 30)
+VARIANT_SCALES = (1, 2)
+
+# Bump when the frame pipeline changes in a way the parameters above don't
+# capture, to invalidate every cached butt.
+PIPELINE_VERSION = 1
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 GIF_DIR = SCRIPT_DIR / "fractured-but-whole"
 OUTPUT_DIR = SCRIPT_DIR.parent / "ButtFrames"
+# Lives outside ButtFrames/ so it isn't copied into the app bundle.
+CACHE_PATH = SCRIPT_DIR / ".butt-cache.json"
+PROFILE_PATH = SCRIPT_DIR / ".butt-profile.json"
 
 
 # -- Helpers ----------------------------------------------------------------
@@ -64,81 +121,719 @@ def display_name(name: str) -> str:
     return " ".join(w[0].upper() + w[1:] for w in spaced.split() if w)
 
 
-def extract_frames(gif_path: Path) -> tuple[list[Image.Image], list[int]]:
-    """Extract all frames and per-frame delays from an animated GIF."""
-    img = Image.open(gif_path)
-    frames = []
-    delays = []
-
-    # Build a canvas to composite frames onto (handles disposal methods)
-    canvas = Image.new("RGBA", img.size, (255, 255, 255, 255))
+def iter_frames(gif_path: Path) -> Iterator[tuple[Image.Image, int]]:
+    """Yield each composited frame of an animated GIF with its delay.
 
-    for i in range(getattr(img, "n_frames", 1)):
-        img.seek(i)
-        # GIF stores per-frame delay in the Graphic Control Extension block.
-        # Pillow exposes it via img.info['duration'] after each seek().
-        delay = img.info.get("duration", 100)
-        if delay < 10:
-            delay = 100
+    Frames are composited onto one reused canvas, so only a single
+    full-resolution frame is alive at a time no matter how long the
+    animation is. The yielded image IS that canvas: finish with it before
+    advancing the iterator, or copy() it to keep it.
+    """
+    with Image.open(gif_path) as img:
+        # Build a canvas to composite frames onto (handles disposal methods)
+        canvas = Image.new("RGBA", img.size, (255, 255, 255, 255))
+
+        for i in range(getattr(img, "n_frames", 1)):
+            with stage("decode"):
+                img.seek(i)
+                frame = img.convert("RGBA")
+            # GIF stores per-frame delay in the Graphic Control Extension block.
+            # Pillow exposes it via img.info['duration'] after each seek().
+            delay = img.info.get("duration", 100)
+            if delay < 10:
+                delay = 100
+            with stage("composite"):
+                canvas.paste(frame, (0, 0), frame)
+            yield canvas, delay
+
+
+def min_filter(stack: np.ndarray, size: int) -> np.ndarray:
+    """size x size minimum filter over each (H, W) image in a (frames, H, W) stack.
+
+    Equivalent to PIL's ImageFilter.MinFilter(size), including replicating
+    edge pixels at the borders. The min is separable, so it runs as one
+    pass along rows and one along columns, over the whole batch at once.
+    """
+    r = size // 2
+    padded = np.pad(stack, ((0, 0), (r, r), (r, r)), mode="edge")
+    h, w = stack.shape[1:]
+    rows = padded[:, :, :w].copy()
+    for dx in range(1, size):
+        np.minimum(rows, padded[:, :, dx:dx + w], out=rows)
+    result = rows[:, :h].copy()
+    for dy in range(1, size):
+        np.minimum(result, rows[:, dy:dy + h], out=result)
+    return result
+
+
+def process_batch(grays: list[np.ndarray]) -> list[dict[str, Image.Image]]:
+    """Turn grayscale frames into an RGBA outline image per line weight.
+
+    Pipeline, on the batch stacked as one (frames, H, W) array:
+      1. If the weight has a filter size, apply a min filter to thicken
+         lines (e.g. +1px at 512px scale for bold, before resize to
+         preserve the artist's line quality)
+      2. Resize to 160x160 (per frame, in PIL)
+      3. Invert grayscale → alpha, RGB = black
+         Dark lines become opaque black, white background becomes transparent.
+    """
+    stack = np.stack(grays)
+    per_weight = {}
+    for weight, (_, filter_size) in LINE_WEIGHTS.items():
+        with stage("filter"):
+            gray = min_filter(stack, filter_size) if filter_size else stack
+        # Resize before alpha conversion to avoid blending artifacts in Lanczos.
+        with stage("resize"):
+            resized = np.stack([
+                np.asarray(Image.fromarray(g).resize(FRAME_SIZE, resample=RESAMPLE)) for g in gray
+            ])
+        with stage("alpha"):
+            rgba = np.zeros(resized.shape + (4,), dtype=np.uint8)
+            np.subtract(255, resized, out=rgba[..., 3])
+            per_weight[weight] = rgba
+    with stage("alpha"):
+        return [
+            {weight: Image.fromarray(per_weight[weight][i], "RGBA") for weight in LINE_WEIGHTS}
+            for i in range(len(grays))
+        ]
+
+
+def process_frames(
+    frames: Iterable[tuple[Image.Image, int]],
+) -> Iterator[tuple[dict[str, Image.Image], int]]:
+    """Yield ({line weight: RGBA outline image}, delay) for each frame.
+
+    Each frame is converted to grayscale (luminance) as it arrives — once,
+    shared by all weights — and processed BATCH_FRAMES at a time by
+    process_batch, so only one batch of full-resolution frames is held.
+    """
+    grays: list[np.ndarray] = []
+    delays: list[int] = []
+    for frame, delay in frames:
+        with stage("grayscale"):
+            grays.append(np.asarray(frame.convert("L")))
         delays.append(delay)
-        frame = img.convert("RGBA")
-        canvas.paste(frame, (0, 0), frame)
-        frames.append(canvas.copy())
+        if len(grays) == BATCH_FRAMES:
+            yield from zip(process_batch(grays), delays)
+            grays, delays = [], []
+    if grays:
+        yield from zip(process_batch(grays), delays)
+
 
-    return frames, delays
+def frames_match(a: dict[str, Image.Image], b: dict[str, Image.Image], tolerance: int) -> bool:
+    """True if every line weight of two rendered frames is within tolerance.
 
+    tolerance is the largest per-channel difference (0-255) still treated
+    as the same frame; 0 means pixel-identical.
+    """
+    for weight in LINE_WEIGHTS:
+        diff = ImageChops.difference(a[weight], b[weight])
+        if max(hi for _, hi in diff.getextrema()) > tolerance:
+            return False
+    return True
+
+
+def output_filenames(entry: dict) -> list[str]:
+    """All PNG filenames written for a butt, given its manifest entry."""
+    if "atlas" in entry:
+        names = [f"atlas{suffix}.png" for suffix, _ in LINE_WEIGHTS.values()]
+    else:
+        names = []
+        for i in range(entry["frameCount"]):
+            for suffix, _ in LINE_WEIGHTS.values():
+                names.append(f"frame_{i:02d}{suffix}.png")
+    if "variants" in entry:
+        for mode in entry["variants"]["modes"]:
+            for suffix, _ in LINE_WEIGHTS.values():
+                names.append(f"variant_{mode}{suffix}.png")
+    return names
+
+
+def content_box(frames: list[dict[str, Image.Image]]) -> tuple[int, int, int, int]:
+    """Union bounding box of the non-transparent pixels in every line weight
+    of every frame, as a PIL (left, upper, right, lower) box.
+
+    Line weights share one box so their frames keep a single set of
+    offsets. Fully transparent input gets a 1x1 box, since a PNG can't be
+    empty.
+    """
+    boxes = [
+        box for weights in frames for image in weights.values()
+        if (box := image.getchannel("A").getbbox())
+    ]
+    if not boxes:
+        return (0, 0, 1, 1)
+    lefts, uppers, rights, lowers = zip(*boxes)
+    return (min(lefts), min(uppers), max(rights), max(lowers))
+
+
+def pack_atlas(images: list[Image.Image]) -> tuple[Image.Image, list[dict]]:
+    """Pack frames into a near-square grid sprite sheet.
+
+    Cells are sized to the largest frame (frames are all the same size
+    unless trimmed one by one). Returns the sheet and one {"x", "y", "w",
+    "h"} pixel rect per frame, in frame order (row-major).
+    """
+    w = max(image.width for image in images)
+    h = max(image.height for image in images)
+    columns = math.ceil(math.sqrt(len(images)))
+    rows = math.ceil(len(images) / columns)
+    sheet = Image.new("RGBA", (columns * w, rows * h), (0, 0, 0, 0))
+    rects = []
+    for i, image in enumerate(images):
+        x, y = (i % columns) * w, (i // columns) * h
+        sheet.paste(image, (x, y))
+        rects.append({"x": x, "y": y, "w": image.width, "h": image.height})
+    return sheet, rects
+
+
+def variant_strips() -> list[dict]:
+    """Layout of a variant sheet: one {"size", "y"} row per pixel size.
+
+    Row k holds every frame at that size side by side (frame i at
+    x = i * size), stacked top to bottom from the smallest size up.
+    """
+    sizes = sorted({pt * scale for pt in VARIANT_POINT_SIZES for scale in VARIANT_SCALES})
+    strips = []
+    y = 0
+    for size in sizes:
+        strips.append({"size": size, "y": y})
+        y += size
+    return strips
 
-def process_frame(frame: Image.Image, bold: bool = False) -> Image.Image:
-    """Convert a single RGBA frame to an RGBA outline image.
 
-    Pipeline:
-      1. Convert to grayscale (luminance)
-      2. Resize to 160x160
-      3. If bold, apply MinFilter(3) to thicken lines (+1px at 512px scale,
-         before resize to preserve the artist's line quality)
-      4. Invert grayscale → alpha, RGB = black
-         Dark lines become opaque black, white background becomes transparent.
+def render_mode(alpha: Image.Image, mode: str) -> Image.Image:
+    """Composite an outline alpha mask the way DisplayMode.processFrame does.
+
+    outline   black lines (the frame as-is); drawn as a template
+    stencil   white fill with the lines cut out; drawn as a template
+    original  black lines on an opaque white background
     """
-    grayscale = frame.convert("L")
-    if bold:
-        grayscale = grayscale.filter(ImageFilter.MinFilter(size=3))
-    resized_gray = grayscale.resize(FRAME_SIZE, resample=RESAMPLE)
+    if mode == "outline":
+        black = Image.new("L", alpha.size, 0)
+        return Image.merge("RGBA", (black, black, black, alpha))
+    inverted = ImageOps.invert(alpha)
+    if mode == "stencil":
+        white = Image.new("L", alpha.size, 255)
+        return Image.merge("RGBA", (white, white, white, inverted))
+    opaque = Image.new("L", alpha.size, 255)
+    return Image.merge("RGBA", (inverted, inverted, inverted, opaque))
+
+
+def render_variants(alphas: list[Image.Image], strips: list[dict]) -> dict[str, Image.Image]:
+    """One sheet per display mode holding every frame at every strip size.
+
+    Each frame's alpha is resized straight from the 160px frame, then
+    composited at the target size, so the app blits pixels 1:1 instead of
+    compositing and resampling at runtime.
+    """
+    width = len(alphas) * max(strip["size"] for strip in strips)
+    height = sum(strip["size"] for strip in strips)
+    sheets = {mode: Image.new("RGBA", (width, height), (0, 0, 0, 0)) for mode in DISPLAY_MODES}
+    for strip in strips:
+        size = strip["size"]
+        for i, alpha in enumerate(alphas):
+            small = alpha.resize((size, size), resample=RESAMPLE)
+            for mode, sheet in sheets.items():
+                sheet.paste(render_mode(small, mode), (i * size, strip["y"]))
+    return sheets
+
+
+# -- Build cache ------------------------------------------------------------
+
+def pipeline_params(options: dict) -> dict:
+    """Everything besides the source GIF that affects the output PNGs."""
+    return {
+        "version": PIPELINE_VERSION,
+        "frameSize": list(FRAME_SIZE),
+        "resample": int(RESAMPLE),
+        "lineWeights": {w: list(v) for w, v in LINE_WEIGHTS.items()},
+        **options,
+    }
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 hex digest of a file's contents."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_cache(options: dict) -> dict[str, dict]:
+    """Load cached butts keyed by GIF filename, or {} if stale or missing.
+
+    A cache written with different pipeline parameters is discarded whole,
+    since every butt would need rebuilding anyway.
+    """
+    if not CACHE_PATH.exists():
+        return {}
+    try:
+        cache = json.loads(CACHE_PATH.read_text())
+    except (json.JSONDecodeError, ValueError):
+        print("  WARNING: Could not parse build cache, rebuilding all", file=sys.stderr)
+        return {}
+    if cache.get("params") != pipeline_params(options):
+        print("Pipeline parameters changed, rebuilding all")
+        return {}
+    return cache.get("butts", {})
+
+
+def save_cache(butts: dict[str, dict], options: dict):
+    """Write the cache for the butts built (or reused) in this run."""
+    cache = {"params": pipeline_params(options), "butts": dict(sorted(butts.items()))}
+    CACHE_PATH.write_text(json.dumps(cache, indent=2) + "\n")
+
+
+def is_cache_hit(cached: dict | None, digest: str) -> bool:
+    """True if the cached build matches digest and its PNGs are still on disk."""
+    if not cached or cached.get("sha256") != digest:
+        return False
+    out_dir = OUTPUT_DIR / cached["entry"]["id"]
+    return all((out_dir / name).exists() for name in output_filenames(cached["entry"]))
+
+
+def load_manifest_entries() -> dict[str, dict]:
+    """Entries of the current ButtFrames/manifest.json keyed by id, or {}."""
+    manifest_path = OUTPUT_DIR / "manifest.json"
+    if not manifest_path.exists():
+        return {}
+    try:
+        return {e["id"]: e for e in json.loads(manifest_path.read_text())["butts"]}
+    except (json.JSONDecodeError, ValueError, KeyError):
+        return {}
+
+
+def write_manifest(entries: list[dict]) -> Path:
+    """Write ButtFrames/manifest.json sorted by id, leaving it untouched if unchanged.
 
-    # Resize before alpha conversion to avoid blending artifacts in Lanczos.
-    inverted = ImageOps.invert(resized_gray)
-    black = Image.new("L", FRAME_SIZE, 0)
-    return Image.merge("RGBA", (black, black, black, inverted))
+    manifest.bin, the compact form the app reads at launch, is written
+    alongside (see binary_manifest.py).
+    """
+    manifest = {"butts": sorted(entries, key=lambda e: e["id"])}
+    manifest_path = OUTPUT_DIR / "manifest.json"
+    write_if_changed(manifest_path, (json.dumps(manifest, indent=2) + "\n").encode())
+    write_if_changed(OUTPUT_DIR / "manifest.bin", encode_butts(manifest["butts"]))
+    return manifest_path
 
 
 # -- Main -------------------------------------------------------------------
 
-def process_gif(gif_path: Path) -> dict | None:
-    """Process a single GIF and return its manifest entry, or None on error."""
+def render_outputs(
+    frames: Iterable[tuple[Image.Image, int]],
+    options: dict,
+    emit: Callable[[str, Image.Image, Image.Image | None], None],
+) -> dict:
+    """Render every output PNG for one butt, streaming frames through.
+
+    Frames are processed in batches as they arrive (see process_frames)
+    and each finished PNG is handed to emit(filename, image, untrimmed)
+    right away, so nothing full-resolution is held beyond the current
+    batch. untrimmed is the
+    image before transparent borders were cropped (None when trimming is
+    off or doesn't apply), for reporting savings.
+
+    options["format"] picks the layout: "frames" is one PNG per frame and
+    line weight, "atlas" packs all frames of a line weight into a single
+    sprite sheet (emitted at the end, so the 160px frames are kept until
+    then). options["dedup"], when not None, is the frames_match tolerance
+    for collapsing runs of consecutive matching frames into one held frame
+    whose delay is the sum of the run. Each frame is compared with the
+    first frame of its run, so slow drift can't chain into one long hold;
+    the loop seam (last -> first) is left alone to keep frame 0 the start.
+    options["trim"] crops away fully transparent borders: "union" to one
+    box shared by every frame (so frames are kept until the end), "frame"
+    to each frame's own box. options["variants"] additionally emits one
+    variant_<mode> sheet per display mode and line weight (see
+    render_variants).
+
+    Returns the manifest fields: frameCount and frameDelays, plus frameMap
+    (source frame -> output frame) with dedup, the frame rects in atlas
+    mode, each frame's rect on the 160px canvas with trim, and the variant
+    modes and strip layout with variants.
+    """
+    tolerance = options["dedup"]
+    atlas = options["format"] == "atlas"
+    trim = options["trim"]
+    variants = options["variants"]
+    # Union trimming needs every frame's box before the first crop
+    buffered = trim == "union"
+
+    delays: list[int] = []
+    frame_map: list[int] = []
+    last_kept = None
+    kept: list[dict[str, Image.Image]] = []
+    trim_rects: list[dict] = []
+    sheet_frames: dict[str, list[Image.Image]] = {w: [] for w in LINE_WEIGHTS}
+    untrimmed_frames: dict[str, list[Image.Image]] = {w: [] for w in LINE_WEIGHTS}
+    variant_alphas: dict[str, list[Image.Image]] = {w: [] for w in LINE_WEIGHTS}
+
+    def write_frame(i: int, weights: dict[str, Image.Image], box):
+        """Crop one kept frame to box (None = no trim) and emit or queue it."""
+        if box is not None:
+            left, upper, right, lower = box
+            trim_rects.append({"x": left, "y": upper, "w": right - left, "h": lower - upper})
+        for weight, (suffix, _) in LINE_WEIGHTS.items():
+            full = weights[weight]
+            with stage("trim"):
+                image = full if box is None else full.crop(box)
+            if atlas:
+                sheet_frames[weight].append(image)
+                if box is not None:
+                    untrimmed_frames[weight].append(full)
+            else:
+                emit(f"frame_{i:02d}{suffix}.png", image, None if box is None else full)
+
+    for weights, delay in process_frames(frames):
+        with stage("dedup"):
+            duplicate = (tolerance is not None and last_kept is not None
+                         and frames_match(last_kept, weights, tolerance))
+        if duplicate:
+            delays[-1] += delay
+        else:
+            last_kept = weights
+            delays.append(delay)
+            if variants:
+                for weight in LINE_WEIGHTS:
+                    variant_alphas[weight].append(weights[weight].getchannel("A"))
+            if buffered:
+                kept.append(weights)
+            else:
+                with stage("trim"):
+                    box = content_box([weights]) if trim == "frame" else None
+                write_frame(len(delays) - 1, weights, box)
+        frame_map.append(len(delays) - 1)
+
+    if kept:
+        with stage("trim"):
+            box = content_box(kept)
+        for i, weights in enumerate(kept):
+            write_frame(i, weights, box)
+
+    fields = {"frameCount": len(delays), "frameDelays": delays}
+    if tolerance is not None:
+        fields["frameMap"] = frame_map
+
+    if atlas and delays:
+        for weight, (suffix, _) in LINE_WEIGHTS.items():
+            # Every weight packs to the same layout, so any one's rects will do
+            with stage("atlas"):
+                sheet, rects = pack_atlas(sheet_frames[weight])
+                untrimmed = pack_atlas(untrimmed_frames[weight])[0] if trim else None
+            emit(f"atlas{suffix}.png", sheet, untrimmed)
+        fields["atlas"] = {"frames": rects}
+
+    if trim and delays:
+        fields["trim"] = {"w": FRAME_SIZE[0], "h": FRAME_SIZE[1], "frames": trim_rects}
+
+    if variants and delays:
+        strips = variant_strips()
+        for weight, (suffix, _) in LINE_WEIGHTS.items():
+            with stage("variants"):
+                sheets = render_variants(variant_alphas[weight], strips)
+            for mode, sheet in sheets.items():
+                emit(f"variant_{mode}{suffix}.png", sheet, None)
+        fields["variants"] = {"modes": list(DISPLAY_MODES), "strips": strips}
+
+    return fields
+
+
+def process_gif(gif_path: Path, options: dict) -> tuple[dict, dict] | None:
+    """Process a single GIF and return (manifest entry, stats), or None on error.
+
+    stats["bytes"] is the total size of the PNGs written. With a PNG preset
+    other than the default, stats["baselineBytes"] is what the same images
+    would take with the default preset, for reporting savings. Likewise
+    stats["untrimmedBytes"] and stats["pixels"] / stats["untrimmedPixels"]
+    compare the output against the same images without trimming.
+
+    The encoded PNGs are held until the whole GIF has rendered, so a GIF
+    that fails partway (e.g. caught half-saved) leaves its previous
+    folder exactly as it was.
+    """
     slug = slugify(gif_path.name)
     name = display_name(gif_path.name)
     out_dir = OUTPUT_DIR / slug
 
+    preset = options["png"]
+    stats = {"bytes": 0, "baselineBytes": 0, "untrimmedBytes": 0, "pixels": 0, "untrimmedPixels": 0}
+    encoded: dict[str, bytes] = {}
+
+    def emit(filename: str, image: Image.Image, untrimmed: Image.Image | None):
+        with stage("encode"):
+            encoded[filename] = encode_png(image, preset)
+        size = len(encoded[filename])
+        stats["bytes"] += size
+        # Extra encodes below only feed the savings report
+        with stage("report"):
+            stats["untrimmedBytes"] += size if untrimmed is None else len(encode_png(untrimmed, preset))
+            if preset != DEFAULT_PRESET:
+                size = len(encode_png(image, DEFAULT_PRESET))
+        stats["baselineBytes"] += size
+        full = image if untrimmed is None else untrimmed
+        stats["pixels"] += image.width * image.height
+        stats["untrimmedPixels"] += full.width * full.height
+
     try:
-        frames, delays = extract_frames(gif_path)
+        fields = render_outputs(iter_frames(gif_path), options, emit)
     except Exception as e:
-        print(f"  ERROR extracting {gif_path.name}: {e}", file=sys.stderr)
+        print(f"  ERROR rendering {gif_path.name}: {e}", file=sys.stderr)
         return None
 
-    if len(frames) <= 1:
-        print(f"  WARNING: {gif_path.name} has only {len(frames)} frame(s) — will not animate", file=sys.stderr)
+    if fields["frameCount"] <= 1:
+        print(f"  WARNING: {gif_path.name} has only {fields['frameCount']} frame(s) — will not animate", file=sys.stderr)
+
+    entry = {"id": slug, "name": name, **fields}
 
-    out_dir.mkdir(parents=True, exist_ok=True)
+    with stage("write"):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        # Unchanged PNGs keep their mtimes, so Xcode doesn't recopy them
+        for filename, data in encoded.items():
+            write_if_changed(out_dir / filename, data)
+        # Drop files left over from a previous build (more frames, other format)
+        expected = set(output_filenames(entry))
+        for stale in out_dir.glob("*.png"):
+            if stale.name not in expected:
+                stale.unlink()
 
-    for i, frame in enumerate(frames):
-        rgba = process_frame(frame)
-        rgba.save(out_dir / f"frame_{i:02d}.png", "PNG")
-        rgba_bold = process_frame(frame, bold=True)
-        rgba_bold.save(out_dir / f"frame_{i:02d}_bold.png", "PNG")
+    return entry, stats
 
-    return {"id": slug, "name": name, "frameCount": len(frames), "frameDelays": delays}
+
+def check_gif(gif_path: Path, options: dict) -> list[str]:
+    """Render a GIF in memory and compare it against the PNGs on disk.
+
+    Compares decoded RGBA pixels rather than file bytes, so a different
+    zlib build or PNG preset doesn't count as a mismatch. Returns a list of problems (empty
+    if everything matches).
+    """
+    out_dir = OUTPUT_DIR / slugify(gif_path.name)
+    problems = []
+
+    def emit(filename: str, image: Image.Image, untrimmed: Image.Image | None):
+        path = out_dir / filename
+        if not path.exists():
+            problems.append(f"{path.relative_to(OUTPUT_DIR)}: missing")
+            return
+        with stage("compare"), Image.open(path) as on_disk:
+            if on_disk.size != image.size:
+                problems.append(
+                    f"{path.relative_to(OUTPUT_DIR)}: {on_disk.size}, expected {image.size}"
+                )
+            elif on_disk.convert("RGBA").tobytes() != image.tobytes():
+                problems.append(f"{path.relative_to(OUTPUT_DIR)}: pixels differ")
+
+    render_outputs(iter_frames(gif_path), options, emit)
+    return problems
+
+
+def check_all(gif_files: list[Path], options: dict) -> int:
+    """Golden check of every GIF against ButtFrames/. Returns the failure count."""
+    failures = 0
+    for gif_path in gif_files:
+        try:
+            with profiling.asset(gif_path.name):
+                problems = check_gif(gif_path, options)
+        except Exception as e:
+            problems = [f"ERROR: {e}"]
+        if problems:
+            failures += 1
+            print(f"  FAIL  {gif_path.name}")
+            for problem in problems:
+                print(f"          {problem}")
+    return failures
+
+
+def process_gif_safe(gif_path: Path, options: dict) -> tuple[dict, dict] | None:
+    """Run process_gif, reporting any failure instead of raising.
+
+    Used as the pool worker so one bad GIF can't abort the whole batch.
+    """
+    try:
+        return process_gif(gif_path, options)
+    except Exception as e:
+        print(f"  ERROR processing {gif_path.name}: {e}", file=sys.stderr)
+        return None
+
+
+def process_all(
+    gif_files: list[Path], jobs: int, options: dict,
+) -> list[tuple[dict, dict] | None]:
+    """Process every GIF, returning results in the same order as gif_files.
+
+    jobs=1 runs in-process; otherwise GIFs are spread across a process pool.
+    Results are collected in submission order, so output is deterministic
+    regardless of which worker finishes first. With --profile, each GIF's
+    stage timings are recorded under its name and merged here.
+    """
+    worker = partial(process_gif_safe, options=options)
+    profile = profiling.is_enabled()
+
+    def collect(result_and_records):
+        result, records = result_and_records
+        profiling.add_records(records)
+        return result
+
+    if jobs <= 1:
+        return [collect(profiling.run_profiled(worker, p, p.name, profile)) for p in gif_files]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(profiling.run_profiled, worker, p, p.name, profile) for p in gif_files
+        ]
+        results = []
+        for gif_path, future in zip(gif_files, futures):
+            # A worker that dies outright (e.g. killed by the OS) surfaces
+            # here rather than inside process_gif_safe.
+            try:
+                results.append(collect(future.result()))
+            except Exception as e:
+                print(f"  ERROR processing {gif_path.name}: {e}", file=sys.stderr)
+                results.append(None)
+        return results
+
+
+def rebuild_changed(
+    changed: list[Path], butts: dict[str, dict], jobs: int, options: dict,
+    args: argparse.Namespace,
+):
+    """--watch handler: rebuild just the changed GIFs and patch the manifest.
+
+    butts is the build cache ({GIF name: {"sha256", "entry"}}) from the
+    last build, updated in place. A GIF that fails to build (say, saved
+    half-written) writes nothing, since process_gif only writes once every
+    frame has rendered, so its previous frames and entry stay as they were
+    until a good save.
+    """
+    to_build = []
+    digests = {}
+    for gif_path in changed:
+        if gif_path.exists():
+            digests[gif_path] = hash_file(gif_path)
+            if not is_cache_hit(butts.get(gif_path.name), digests[gif_path]):
+                to_build.append(gif_path)
+        elif gif_path.name in butts:
+            removed = butts.pop(gif_path.name)["entry"]["id"]
+            if removed not in {b["entry"]["id"] for b in butts.values()}:
+                shutil.rmtree(OUTPUT_DIR / removed, ignore_errors=True)
+            print(f"  Removed {removed}/")
+
+    for gif_path, result in zip(to_build, process_all(to_build, jobs, options)):
+        if result:
+            entry, stats = result
+            butts[gif_path.name] = {"sha256": digests[gif_path], "entry": entry}
+            print(f"  {entry['id']:30s}  {entry['frameCount']:3d} frames  "
+                  f"{stats['bytes'] / 1024:7.1f} KB{savings_report(stats, args)}")
+
+    write_manifest([b["entry"] for b in butts.values()])
+    save_cache(butts, options)
+
+
+def last_built_entries(gif_files: list[Path], options: dict) -> tuple[list[dict], list[str]]:
+    """Manifest entries from each GIF's last build, for --manifest-only.
+
+    An entry comes from the build cache (for a GIF whose last build failed,
+    that's its previous good entry, as in a normal run), or failing that
+    from the current manifest.json. Returns (entries, GIFs built by neither).
+    """
+    cache = load_cache(options)
+    previous_entries = load_manifest_entries()
+    entries, missing = [], []
+    for gif_path in gif_files:
+        if gif_path.name in cache:
+            entries.append(cache[gif_path.name]["entry"])
+        elif slugify(gif_path.name) in previous_entries:
+            entries.append(previous_entries[slugify(gif_path.name)])
+        else:
+            missing.append(gif_path.name)
+    return entries, missing
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert animated GIF butts into PNG frames.")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="number of worker processes (0 = one per CPU core, default: 1)",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="ignore the build cache and rebuild every butt from scratch",
+    )
+    parser.add_argument(
+        "--atlas", action="store_true",
+        help="pack each butt's frames into one sprite sheet per line weight",
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="render in memory and verify ButtFrames/ matches pixel for pixel, writing nothing",
+    )
+    parser.add_argument(
+        "--dedup", type=int, nargs="?", const=0, default=None, metavar="TOLERANCE",
+        help="merge consecutive frames whose pixels differ by at most TOLERANCE "
+             "(0-255, default 0 = identical) and sum their delays",
+    )
+    parser.add_argument(
+        "--png", choices=sorted(PRESETS), default=DEFAULT_PRESET,
+        help=f"PNG encoding preset (default: {DEFAULT_PRESET})",
+    )
+    parser.add_argument(
+        "--variants", action="store_true",
+        help="also pre-render every display mode at menu bar and Touch Bar pixel sizes",
+    )
+    parser.add_argument(
+        "--trim", choices=("union", "frame"), default=None,
+        help="crop fully transparent borders: to one box per butt (union) "
+             "or per frame (frame), recording offsets in the manifest",
+    )
+    parser.add_argument(
+        "--profile", type=Path, nargs="?", const=PROFILE_PATH, default=None, metavar="JSON",
+        help="time every stage per GIF, print the slowest, and write JSON "
+             f"(default: {PROFILE_PATH.name})",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="after building, keep watching the GIF folder and rebuild each GIF as it changes",
+    )
+    parser.add_argument(
+        "--frames-only", action="store_true",
+        help="build the frame folders and the build cache, but don't write the manifest",
+    )
+    parser.add_argument(
+        "--manifest-only", action="store_true",
+        help="write manifest.json and manifest.bin from each GIF's last build, rendering nothing",
+    )
+    args = parser.parse_args()
+    if args.watch and args.check:
+        parser.error("--watch can't be combined with --check")
+    if args.frames_only and (args.check or args.watch or args.manifest_only):
+        parser.error("--frames-only can't be combined with --check, --watch or --manifest-only")
+    if args.manifest_only and (args.check or args.watch or args.force):
+        parser.error("--manifest-only can't be combined with --check, --watch or --force")
+    return args
+
+
+def savings_report(stats: dict, args: argparse.Namespace) -> str:
+    """Savings versus the default PNG preset and versus untrimmed frames."""
+    line = ""
+    if args.png != DEFAULT_PRESET:
+        line += f" ({(stats['bytes'] - stats['baselineBytes']) / 1024:+.1f} KB vs {DEFAULT_PRESET})"
+    if args.trim and stats["untrimmedPixels"]:
+        saved = 1 - stats["pixels"] / stats["untrimmedPixels"]
+        line += (f" (trim: {saved:.0%} fewer pixels, "
+                 f"{(stats['bytes'] - stats['untrimmedBytes']) / 1024:+.1f} KB)")
+    return line
 
 
 def main():
+    args = parse_args()
+    started = time.perf_counter()
+    profiling.enable(args.profile is not None)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    # Options reach the workers as plain arguments and also key the build cache
+    options = {
+        "format": "atlas" if args.atlas else "frames",
+        "dedup": args.dedup,
+        "png": args.png,
+        "variants": args.variants,
+        "trim": args.trim,
+    }
+
     gif_files = sorted(GIF_DIR.glob("*.gif"))
 
     if not gif_files:
@@ -146,32 +841,102 @@ def main():
         sys.exit(1)
 
     print(f"Found {len(gif_files)} GIFs in {GIF_DIR}")
-
-    # Clean output directory
-    if OUTPUT_DIR.exists():
-        import shutil
-        shutil.rmtree(OUTPUT_DIR)
+    if args.check:
+        failures = check_all(gif_files, options)
+        if args.profile:
+            profiling.report(args.profile, time.perf_counter() - started)
+        if failures:
+            print(f"\nCheck failed: {failures} of {len(gif_files)} butts differ", file=sys.stderr)
+            sys.exit(1)
+        print(f"Check passed: all {len(gif_files)} butts match {OUTPUT_DIR}")
+        return
+
+    if args.manifest_only:
+        entries, missing = last_built_entries(gif_files, options)
+        if missing:
+            print(f"Not built yet: {', '.join(missing)} (run without --manifest-only)", file=sys.stderr)
+            sys.exit(1)
+        print(f"Manifest: {write_manifest(entries)} ({len(entries)} butts)")
+        return
+
+    if jobs > 1:
+        print(f"Using {jobs} worker processes")
+
+    if args.force:
+        if args.frames_only and OUTPUT_DIR.exists():
+            # Keep manifest.json/.bin for --manifest-only to rewrite
+            for child in OUTPUT_DIR.iterdir():
+                if child.is_dir():
+                    shutil.rmtree(child)
+        elif OUTPUT_DIR.exists():
+            shutil.rmtree(OUTPUT_DIR)
+        cache = {}
+    else:
+        cache = load_cache(options)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+    # Split into butts we can reuse as-is and butts that need (re)building
+    with stage("hash"):
+        digests = {p.name: hash_file(p) for p in gif_files}
+    previous_entries = load_manifest_entries()
+    new_cache: dict[str, dict] = {}
     manifest_entries = []
-
+    to_build = []
     for gif_path in gif_files:
-        entry = process_gif(gif_path)
-        if entry:
+        cached = cache.get(gif_path.name)
+        if is_cache_hit(cached, digests[gif_path.name]):
+            new_cache[gif_path.name] = cached
+            manifest_entries.append(cached["entry"])
+        else:
+            to_build.append(gif_path)
+
+    print(f"{len(gif_files) - len(to_build)} unchanged, {len(to_build)} to build")
+
+    totals = {"bytes": 0, "baselineBytes": 0, "untrimmedBytes": 0, "pixels": 0, "untrimmedPixels": 0}
+    for gif_path, result in zip(to_build, process_all(to_build, jobs, options)):
+        if result:
+            entry, stats = result
+            new_cache[gif_path.name] = {"sha256": digests[gif_path.name], "entry": entry}
             manifest_entries.append(entry)
-            print(f"  {entry['id']:30s}  {entry['frameCount']:3d} frames")
-
-    # Sort manifest alphabetically by id
-    manifest_entries.sort(key=lambda e: e["id"])
-
-    manifest = {"butts": manifest_entries}
-    manifest_path = OUTPUT_DIR / "manifest.json"
-    manifest_path.write_text(json.dumps(manifest, indent=2) + "\n")
+            for key in totals:
+                totals[key] += stats[key]
+            print(f"  {entry['id']:30s}  {entry['frameCount']:3d} frames  "
+                  f"{stats['bytes'] / 1024:7.1f} KB{savings_report(stats, args)}")
+        elif gif_path.name in cache:
+            # A GIF that fails to build wrote nothing, so it keeps its previous
+            # frames and entry (and its cache entry, so a good save is
+            # picked up next run)
+            new_cache[gif_path.name] = cache[gif_path.name]
+            manifest_entries.append(cache[gif_path.name]["entry"])
+            print(f"  Kept previous {cache[gif_path.name]['entry']['id']}/")
+        elif slugify(gif_path.name) in previous_entries:
+            manifest_entries.append(previous_entries[slugify(gif_path.name)])
+            print(f"  Kept previous {slugify(gif_path.name)}/")
+
+    # Remove output folders only for GIFs that were deleted
+    live_ids = {slugify(p.name) for p in gif_files}
+    for child in sorted(OUTPUT_DIR.iterdir()):
+        if child.is_dir() and child.name not in live_ids:
+            shutil.rmtree(child)
+            print(f"  Removed stale {child.name}/")
+
+    with stage("manifest"):
+        manifest_path = None if args.frames_only else write_manifest(manifest_entries)
+        save_cache(new_cache, options)
 
     total_frames = sum(e["frameCount"] for e in manifest_entries)
     print(f"\nDone: {len(manifest_entries)} butts, {total_frames} frames")
+    if to_build:
+        print(f"Wrote {totals['bytes'] / 1024:.1f} KB of PNGs{savings_report(totals, args)}")
     print(f"Output: {OUTPUT_DIR}")
-    print(f"Manifest: {manifest_path}")
+    print(f"Manifest: {manifest_path or 'not written (--frames-only)'}")
+    if args.profile:
+        profiling.report(args.profile, time.perf_counter() - started)
+
+    if args.watch:
+        profiling.enable(False)
+        watching.watch([GIF_DIR], {".gif"}, partial(rebuild_changed, butts=new_cache,
+                                                  jobs=jobs, options=options, args=args))
 
 
 if __name__ == "__main__":
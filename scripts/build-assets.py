@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""Build every generated asset in one go, skipping what's up to date.
+
+Each output is a target with declared inputs (source files and the
+scripts that process them), the files it produces, and the targets it
+depends on. A target runs only if it was never built, its outputs are
+missing or were changed since its last build, or the contents of its
+inputs changed. Targets that don't depend on each other run at the same
+time, sharing the --jobs worker budget.
+
+Targets:
+  butt-frames      brazilian-butt-lift.py --frames-only    ButtFrames/<id>/ frame folders
+  butt-manifest    brazilian-butt-lift.py --manifest-only  manifest.json + .bin (after butt-frames)
+  sound-segments   sound-check.py --split-only             conversions + shuffle segment WAVs
+  sound-waveforms  sound-check.py                          waveforms, sounds-manifest.json + .bin
+                                                           (after sound-segments)
+  app-icon         generate-app-icon.py                    AppIcon.appiconset (asynchronous-butt.gif only)
+
+Usage:
+    cd scripts/
+    uv run build-assets.py             # build whatever is out of date
+    uv run build-assets.py app-icon    # just these targets (and their dependencies)
+    uv run build-assets.py --force     # rebuild everything
+    uv run build-assets.py --dry-run   # show what would run
+    uv run build-assets.py --list      # show targets, inputs and dependencies
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+# -- Configuration ----------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SCRIPT_DIR.parent
+STAMPS_PATH = SCRIPT_DIR / ".build-stamps.json"
+
+# The generator scripts and every module they import
+BUTT_SCRIPTS = [
+    "scripts/brazilian-butt-lift.py",
+    "scripts/png_encoding.py",
+    "scripts/binary_manifest.py",
+    "scripts/profiling.py",
+    "scripts/watching.py",
+]
+SOUND_SCRIPTS = [
+    "scripts/sound-check.py",
+    "scripts/audio_decode.py",
+    "scripts/shuffle_segments.py",
+    "scripts/waveform_samples.py",
+    "scripts/binary_manifest.py",
+    "scripts/profiling.py",
+    "scripts/watching.py",
+]
+
+# Paths and globs are relative to the repository root. A plain output path
+# must exist for the target to count as built; a glob may match nothing
+# (no shuffle sounds, say), but any file it matches that's added, removed
+# or modified after the build makes the target stale. "args" may use
+# {jobs}, the target's share of the worker budget. "force_args" are added
+# with --force, so generators with their own cache rebuild everything too.
+TARGETS = {
+    "butt-frames": {
+        "script": "brazilian-butt-lift.py",
+        "args": ["--frames-only", "--jobs", "{jobs}"],
+        "force_args": ["--force"],
+        "inputs": ["scripts/fractured-but-whole/*.gif", *BUTT_SCRIPTS],
+        "outputs": ["ButtFrames/*/*.png"],
+        "deps": [],
+    },
+    "butt-manifest": {
+        "script": "brazilian-butt-lift.py",
+        "args": ["--manifest-only"],
+        # The GIFs too: a frame delay can change without any PNG changing
+        "inputs": ["scripts/fractured-but-whole/*.gif", *BUTT_SCRIPTS],
+        "outputs": ["ButtFrames/manifest.json", "ButtFrames/manifest.bin"],
+        "deps": ["butt-frames"],
+    },
+    "sound-segments": {
+        "script": "sound-check.py",
+        "args": ["--split-only", "--jobs", "{jobs}"],
+        "inputs": [
+            "sounds/shuffle_*",
+            *(f"sounds/*{ext}" for ext in (".flac", ".ogg", ".wma", ".opus")),
+            *SOUND_SCRIPTS,
+        ],
+        "outputs": ["sounds/shuffle_*_[0-9][0-9].*"],
+        "deps": [],
+    },
+    "sound-waveforms": {
+        "script": "sound-check.py",
+        "args": ["--jobs", "{jobs}"],
+        "force_args": ["--force"],
+        # The manifest is an input too: names and categories are edited by hand
+        "inputs": ["sounds/*", *SOUND_SCRIPTS],
+        "outputs": ["sounds/sounds-manifest.json", "sounds/sounds-manifest.bin"],
+        "deps": ["sound-segments"],
+    },
+    "app-icon": {
+        "script": "generate-app-icon.py",
+        "args": [],
+        "inputs": [
+            "scripts/fractured-but-whole/asynchronous-butt.gif",
+            "scripts/generate-app-icon.py",
+            "scripts/png_encoding.py",
+        ],
+        "outputs": ["pattiSpecialButton/Assets.xcassets/AppIcon.appiconset/icon_*.png"],
+        "deps": [],
+    },
+}
+
+
+# -- Helpers ----------------------------------------------------------------
+
+def expand(patterns: list[str]) -> list[Path]:
+    """Files matching patterns (relative to the repo root), sorted and deduplicated."""
+    files = set()
+    for pattern in patterns:
+        files.update(p for p in ROOT_DIR.glob(pattern) if p.is_file() and not p.name.startswith("."))
+    return sorted(files)
+
+
+def command(name: str, jobs: int, force: bool = False) -> list[str]:
+    """The command line that builds a target."""
+    target = TARGETS[name]
+    return [sys.executable, str(SCRIPT_DIR / target["script"]),
+            *(arg.format(jobs=jobs) for arg in target["args"]),
+            *(target.get("force_args", []) if force else [])]
+
+
+def inputs_digest(name: str) -> str:
+    """SHA-256 over the target's input files (paths and contents) and script args.
+
+    A dependency's outputs count as inputs, so rebuilding a dependency
+    that changes what it produced also makes its dependents stale.
+    """
+    target = TARGETS[name]
+    patterns = target["inputs"] + [p for dep in target["deps"] for p in TARGETS[dep]["outputs"]]
+    digest = hashlib.sha256(json.dumps(target["args"]).encode())
+    for path in expand(patterns):
+        digest.update(str(path.relative_to(ROOT_DIR)).encode() + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def outputs_exist(name: str) -> bool:
+    """True if every plain (non-glob) output path exists."""
+    return all(
+        (ROOT_DIR / pattern).exists()
+        for pattern in TARGETS[name]["outputs"] if not any(c in pattern for c in "*?[")
+    )
+
+
+def outputs_digest(name: str) -> str:
+    """SHA-256 over the target's output paths, sizes and mtimes.
+
+    Cheaper than hashing contents, and enough to notice an output that was
+    deleted (a whole frame folder, say) or touched since the build.
+    """
+    digest = hashlib.sha256()
+    for path in expand(TARGETS[name]["outputs"]):
+        st = path.stat()
+        digest.update(f"{path.relative_to(ROOT_DIR)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def is_up_to_date(name: str, stamp: dict | None) -> bool:
+    return (
+        isinstance(stamp, dict)
+        and stamp.get("inputs") == inputs_digest(name)
+        and outputs_exist(name)
+        and stamp.get("outputs") == outputs_digest(name)
+    )
+
+
+def uses_jobs(name: str) -> bool:
+    return any("{jobs}" in arg for arg in TARGETS[name]["args"])
+
+
+def load_stamps() -> dict[str, dict]:
+    """{"inputs", "outputs"} digests of each target's last successful build, or {}."""
+    if not STAMPS_PATH.exists():
+        return {}
+    try:
+        return json.loads(STAMPS_PATH.read_text())
+    except (json.JSONDecodeError, ValueError):
+        print("  WARNING: Could not parse build stamps, rebuilding all", file=sys.stderr)
+        return {}
+
+
+def save_stamps(stamps: dict[str, dict]):
+    STAMPS_PATH.write_text(json.dumps(dict(sorted(stamps.items())), indent=2) + "\n")
+
+
+def with_deps(names: list[str]) -> list[str]:
+    """names plus everything they depend on, dependencies first."""
+    ordered: list[str] = []
+
+    def visit(name: str, path: tuple[str, ...]):
+        if name in path:
+            raise ValueError(f"dependency cycle: {' -> '.join(path + (name,))}")
+        if name in ordered:
+            return
+        for dep in TARGETS[name]["deps"]:
+            visit(dep, path + (name,))
+        ordered.append(name)
+
+    for name in names:
+        visit(name, ())
+    return ordered
+
+
+def run_target(name: str, jobs: int, force: bool) -> tuple[int, str, float]:
+    """Run one target's script. Returns (exit code, combined output, seconds)."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        command(name, jobs, force), cwd=SCRIPT_DIR, capture_output=True, text=True,
+    )
+    return result.returncode, result.stdout + result.stderr, time.perf_counter() - started
+
+
+# -- Main -------------------------------------------------------------------
+
+def build(names: list[str], jobs: int, force: bool, dry_run: bool) -> dict[str, dict]:
+    """Build names in dependency order, running independent targets concurrently.
+
+    A target is checked for staleness only once its dependencies have
+    finished, since their outputs are part of its inputs. A target whose
+    dependency failed is not run. Targets running at the same time split
+    the jobs budget between them (a target without {jobs} counts as one),
+    so the machine isn't oversubscribed. Returns {name: {"status", "seconds"}}.
+    """
+    stamps = load_stamps()
+    results: dict[str, dict] = {}
+    pending = list(names)
+    running = {}
+    allotted: dict[str, int] = {}
+
+    with ThreadPoolExecutor(max_workers=len(names) or 1) as pool:
+        while pending or running:
+            ready = []
+            for name in list(pending):
+                deps = TARGETS[name]["deps"]
+                if any(dep in pending or dep in ready or dep in running.values() for dep in deps):
+                    continue
+                pending.remove(name)
+                if any(results.get(dep, {}).get("status") in ("failed", "blocked") for dep in deps):
+                    results[name] = {"status": "blocked", "seconds": 0.0}
+                    print(f"  {name}: not built, a dependency failed")
+                    continue
+                if not force and is_up_to_date(name, stamps.get(name)):
+                    results[name] = {"status": "up to date", "seconds": 0.0}
+                    print(f"  {name}: up to date")
+                    continue
+                if dry_run:
+                    results[name] = {"status": "would build", "seconds": 0.0}
+                    print(f"  {name}: would run {' '.join([TARGETS[name]['script'], *command(name, jobs, force)[2:]])}")
+                    continue
+                ready.append(name)
+
+            # Whatever the running targets don't hold is shared by the new ones
+            parallel = [name for name in ready if uses_jobs(name)]
+            free = jobs - sum(allotted.values()) - (len(ready) - len(parallel))
+            for name in ready:
+                allotted[name] = max(1, free // len(parallel)) if name in parallel else 1
+                print(f"  {name}: building ({allotted[name]} job{'s' if allotted[name] > 1 else ''})...")
+                running[pool.submit(run_target, name, allotted[name], force)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                allotted.pop(name)
+                code, output, seconds = future.result()
+                # Each target's output is printed in one piece when it finishes
+                print(f"\n── {name} ({seconds:.1f}s) " + "─" * 40)
+                print(output.rstrip())
+                if code == 0:
+                    # Stamp what's on disk now, so the target's own writes
+                    # (e.g. to sounds-manifest.json) don't make it stale
+                    stamps[name] = {"inputs": inputs_digest(name), "outputs": outputs_digest(name)}
+                    save_stamps(stamps)
+                    results[name] = {"status": "built", "seconds": seconds}
+                else:
+                    stamps.pop(name, None)
+                    save_stamps(stamps)
+                    results[name] = {"status": "failed", "seconds": seconds}
+                    print(f"  {name}: FAILED (exit code {code})", file=sys.stderr)
+    return {name: results[name] for name in names}
+
+
+def list_targets():
+    for name, target in TARGETS.items():
+        print(f"{name}  ({target['script']})")
+        print(f"  inputs:  {', '.join(target['inputs'])}")
+        print(f"  outputs: {', '.join(target['outputs'])}")
+        if target["deps"]:
+            print(f"  deps:    {', '.join(target['deps'])}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build every generated asset, skipping what's up to date.")
+    parser.add_argument(
+        "targets", nargs="*", choices=list(TARGETS), metavar="TARGET",
+        help=f"targets to build, with their dependencies (default: all of {', '.join(TARGETS)})",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=0,
+        help="worker processes shared by the generators running at the same time "
+             "(0 = one per CPU core, default: 0)",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="rebuild targets even if their inputs haven't changed, "
+             "passing --force on to generators that keep their own cache",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="show which targets would run without running them",
+    )
+    parser.add_argument(
+        "--list", action="store_true",
+        help="list targets with their inputs, outputs and dependencies",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.list:
+        list_targets()
+        return
+
+    started = time.perf_counter()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    names = with_deps(args.targets or list(TARGETS))
+    print(f"Targets: {', '.join(names)}")
+    results = build(names, jobs, args.force, args.dry_run)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n{'=' * 50}")
+    for name, result in results.items():
+        seconds = f"{result['seconds']:6.1f}s" if result["status"] in ("built", "failed") else " " * 7
+        print(f"  {name:15s} {seconds}  {result['status']}")
+    print(f"  {'─' * 30}")
+    serial = sum(r["seconds"] for r in results.values())
+    print(f"  Total: {elapsed:.1f}s wall ({serial:.1f}s of target time)")
+
+    if any(r["status"] in ("failed", "blocked") for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,31 +3,36 @@
 
 Creates a bold squircle icon with a solid coral background and white butt
 outlines. High contrast, reads at any size.
-Outputs all 10 required PNG sizes for the Xcode asset catalog.
+Outputs all 10 required PNG sizes for the Xcode asset catalog, and
+optionally a standalone .icns.
 
 Usage:
     cd scripts/
     uv run generate-app-icon.py
+    uv run generate-app-icon.py --png smallest   # slowest encode, smallest PNGs
+    uv run generate-app-icon.py --icns AppIcon.icns
 """
 
-import math
+import argparse
 from pathlib import Path
 
-from PIL import Image, ImageDraw, ImageOps
+import numpy as np
+from PIL import Image, ImageOps
+
+from png_encoding import DEFAULT_PRESET, PRESETS, encode_png
 
 # -- Configuration ----------------------------------------------------------
 
 CANVAS_SIZE = 1024
 ICON_BODY_SIZE = 824        # Apple spec: icon body within 1024 canvas
 SQUIRCLE_EXPONENT = 5.0     # Superellipse n — matches Apple's continuous corners
-SUPERSAMPLE = 4             # Anti-aliasing quality multiplier
 BUTT_SCALE = 0.72           # Butt art as fraction of icon body
 
 # Solid coral background
 BG_COLOR = (255, 107, 107)      # #FF6B6B — bold coral
 
 SCRIPT_DIR = Path(__file__).resolve().parent
-GIF_PATH = SCRIPT_DIR / "fractured-but-whole" / "Asynchronous-Butt.gif"
+GIF_PATH = SCRIPT_DIR / "fractured-but-whole" / "asynchronous-butt.gif"
 OUTPUT_DIR = (
     SCRIPT_DIR.parent
     / "pattiSpecialButton"
@@ -79,36 +84,31 @@ def make_squircle_mask(
     canvas_size: int,
     body_size: int,
     exponent: float = 5.0,
-    supersample: int = 4,
 ) -> Image.Image:
     """Generate an anti-aliased superellipse mask.
 
-    Renders at supersample resolution then downsamples with LANCZOS
-    for smooth edges. Returns a grayscale mask (white = inside).
+    Computed analytically at canvas_size: each pixel's coverage comes from
+    its approximate distance to the curve |x|^n + |y|^n = 1 (the implicit
+    function over its gradient length), which antialiases the edge without
+    rendering at a supersampled size and resampling down.
+    Returns a grayscale mask (white = inside).
     """
-    render_size = canvas_size * supersample
-    body_render = body_size * supersample
-
-    a = body_render / 2.0
-    b = body_render / 2.0
-    cx = render_size / 2.0
-    cy = render_size / 2.0
-
-    num_points = 2000
-    points = []
-    for i in range(num_points):
-        theta = 2 * math.pi * i / num_points
-        cos_t = math.cos(theta)
-        sin_t = math.sin(theta)
-        x = cx + a * abs(cos_t) ** (2.0 / exponent) * (1 if cos_t >= 0 else -1)
-        y = cy + b * abs(sin_t) ** (2.0 / exponent) * (1 if sin_t >= 0 else -1)
-        points.append((x, y))
+    radius = body_size / 2.0
+    # Pixel centers relative to the canvas center, in units of the radius
+    coords = np.abs(np.arange(canvas_size) + 0.5 - canvas_size / 2.0) / radius
+    x = coords[np.newaxis, :]
+    y = coords[:, np.newaxis]
 
-    mask_big = Image.new("L", (render_size, render_size), 0)
-    draw = ImageDraw.Draw(mask_big)
-    draw.polygon(points, fill=255)
+    x_pow = x ** (exponent - 1)
+    y_pow = y ** (exponent - 1)
+    inside = x_pow * x + y_pow * y - 1
+    # Gradient length, converted back to pixels
+    gradient = exponent * np.hypot(x_pow, y_pow) / radius
+    with np.errstate(divide="ignore"):
+        distance = inside / gradient  # -inf at the exact center: fully inside
 
-    return mask_big.resize((canvas_size, canvas_size), Image.LANCZOS)
+    coverage = np.clip(0.5 - distance, 0.0, 1.0)
+    return Image.fromarray(np.round(coverage * 255).astype(np.uint8), "L")
 
 
 def build_master_icon(butt_art: Image.Image) -> Image.Image:
@@ -117,7 +117,7 @@ def build_master_icon(butt_art: Image.Image) -> Image.Image:
     Butt outlines are recolored to white and layered directly on coral.
     """
     bg = make_solid_bg(CANVAS_SIZE, BG_COLOR)
-    mask = make_squircle_mask(CANVAS_SIZE, ICON_BODY_SIZE, SQUIRCLE_EXPONENT, SUPERSAMPLE)
+    mask = make_squircle_mask(CANVAS_SIZE, ICON_BODY_SIZE, SQUIRCLE_EXPONENT)
 
     # Apply squircle mask — transparent outside
     bg.putalpha(mask)
@@ -141,7 +141,29 @@ def build_master_icon(butt_art: Image.Image) -> Image.Image:
 
 # -- Main -------------------------------------------------------------------
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate the macOS app icon set.")
+    parser.add_argument(
+        "--png", choices=sorted(PRESETS), default=DEFAULT_PRESET,
+        help=f"PNG encoding preset (default: {DEFAULT_PRESET})",
+    )
+    parser.add_argument(
+        "--icns", type=Path, metavar="PATH",
+        help="also write a macOS .icns icon file to PATH",
+    )
+    return parser.parse_args()
+
+
+def render_sizes(master: Image.Image, sizes) -> dict[int, Image.Image]:
+    """Resize the master once per unique pixel size (several slots share one)."""
+    return {
+        px: master if px == master.width else master.resize((px, px), Image.LANCZOS)
+        for px in sorted(set(sizes), reverse=True)
+    }
+
+
 def main():
+    args = parse_args()
     print(f"Generating app icon from {GIF_PATH.name}...")
 
     butt_art = extract_butt_art(GIF_PATH)
@@ -153,14 +175,33 @@ def main():
     )
 
     master = build_master_icon(butt_art)
+    icons = render_sizes(master, [px for _, px in OUTPUT_SIZES])
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    total_bytes = total_baseline = 0
+    encoded: dict[int, tuple[bytes, int]] = {}
     for filename, px in OUTPUT_SIZES:
-        icon = master.resize((px, px), Image.LANCZOS)
-        icon.save(OUTPUT_DIR / filename, "PNG")
-        print(f"  {filename:25s} {px:4d}px")
+        # Slots that share a pixel size (e.g. 16@2x and 32) share one encode
+        if px not in encoded:
+            data = encode_png(icons[px], args.png)
+            baseline = len(data) if args.png == DEFAULT_PRESET else len(encode_png(icons[px]))
+            encoded[px] = (data, baseline)
+        data, baseline = encoded[px]
+        (OUTPUT_DIR / filename).write_bytes(data)
+        total_bytes += len(data)
+        total_baseline += baseline
+        print(f"  {filename:25s} {px:4d}px  {len(data) / 1024:7.1f} KB")
 
     print(f"\nDone: {len(OUTPUT_SIZES)} icons written to {OUTPUT_DIR}")
+    line = f"Total: {total_bytes / 1024:.1f} KB"
+    if args.png != DEFAULT_PRESET:
+        line += f" ({(total_bytes - total_baseline) / 1024:+.1f} KB vs {DEFAULT_PRESET})"
+    print(line)
+
+    if args.icns:
+        # Pillow picks each ICNS slot's image from the sizes provided
+        master.save(args.icns, format="ICNS", append_images=list(icons.values()))
+        print(f"Wrote {args.icns} ({args.icns.stat().st_size / 1024:.1f} KB)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+"""Encode PNGs with size/speed presets.
+
+Used by brazilian-butt-lift.py and generate-app-icon.py so both pipelines
+share one definition of what "fast" or "smallest" means.
+
+Presets:
+  fast      zlib level 1 — quickest encode, biggest files
+  balanced  zlib level 6 (Pillow's default) — what the assets were built with
+  smallest  exhaustive filter/zlib search, plus a lossless palette form for
+            black-outline frames (see to_palette_alpha)
+"""
+
+import io
+
+from PIL import Image
+
+PRESETS = {
+    "fast": {"compress_level": 1, "compact": False},
+    "balanced": {"compress_level": 6, "compact": False},
+    "smallest": {"optimize": True, "compact": True},
+}
+DEFAULT_PRESET = "balanced"
+
+# Palette index i is black at alpha i, so an alpha plane maps onto it 1:1
+_BLACK_ALPHA_PALETTE = [0, 0, 0] * 256
+_BLACK_ALPHA_TRANSPARENCY = bytes(range(256))
+
+
+def is_black_alpha(image: Image.Image) -> bool:
+    """True if the image is RGBA with every RGB value 0 (only alpha varies).
+
+    The butt frames are like this: black outlines, shape carried entirely
+    by the alpha channel.
+    """
+    if image.mode != "RGBA":
+        return False
+    return all(image.getchannel(c).getextrema() == (0, 0) for c in "RGB")
+
+
+def to_palette_alpha(image: Image.Image) -> Image.Image:
+    """Losslessly convert a black-alpha RGBA image to an 8-bit palette image.
+
+    One byte per pixel instead of four. Decodes (NSImage, Pillow) back to
+    exactly the same RGBA pixels via the PNG tRNS chunk.
+    """
+    alpha = image.getchannel("A")
+    palette = Image.frombytes("P", alpha.size, alpha.tobytes())
+    palette.putpalette(_BLACK_ALPHA_PALETTE)
+    palette.info["transparency"] = _BLACK_ALPHA_TRANSPARENCY
+    return palette
+
+
+def encode_png(image: Image.Image, preset: str = DEFAULT_PRESET) -> bytes:
+    """Encode an image as PNG bytes using the named preset.
+
+    Compaction never changes the decoded RGBA pixels; images it can't
+    represent losslessly are encoded as-is.
+    """
+    settings = dict(PRESETS[preset])
+    compact = settings.pop("compact")
+
+    if compact and is_black_alpha(image):
+        image = to_palette_alpha(image)
+        settings["transparency"] = _BLACK_ALPHA_TRANSPARENCY
+
+    buf = io.BytesIO()
+    image.save(buf, "PNG", **settings)
+    return buf.getvalue()
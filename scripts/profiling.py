@@ -0,0 +1,158 @@
+"""Per-stage timing for the asset pipelines (--profile).
+
+Used by brazilian-butt-lift.py and sound-check.py. Code marks its stages
+with `with stage("resize"):` and the asset being worked on with
+`with asset(path.name):`; both are no-ops until enable() is called, so
+they cost nothing in a normal run.
+
+Each (stage, asset) pair accumulates wall time, CPU time, call count and
+the peak RSS seen by the end of any of its calls. Worker processes run
+their share through run_profiled() and hand their records back to the
+parent, which merges them with add_records(). Wall times of stages that
+ran in parallel workers overlap, so they can sum to more than the run.
+"""
+
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Slowest (stage, asset) pairs listed in the summary
+TOP_N = 10
+
+_enabled = False
+_asset = ""
+_records: dict[tuple[str, str], dict] = {}
+
+
+def enable(enabled: bool = True):
+    """Turn recording on (or off) for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """True if this process is recording (to pass on to pool workers)."""
+    return _enabled
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+@contextmanager
+def asset(name: str):
+    """Attribute the stages run inside the block to the named asset."""
+    global _asset
+    previous, _asset = _asset, name
+    try:
+        yield
+    finally:
+        _asset = previous
+
+
+@contextmanager
+def stage(name: str):
+    """Time the block as one call of the named stage."""
+    if not _enabled:
+        yield
+        return
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        record = _records.setdefault((name, _asset), {
+            "stage": name, "asset": _asset,
+            "wall": 0.0, "cpu": 0.0, "calls": 0, "peakRssMB": 0.0,
+        })
+        record["wall"] += time.perf_counter() - wall
+        record["cpu"] += time.process_time() - cpu
+        record["calls"] += 1
+        record["peakRssMB"] = max(record["peakRssMB"], peak_rss_mb())
+
+
+def take_records() -> list[dict]:
+    """Return this process's records and start afresh."""
+    records = list(_records.values())
+    _records.clear()
+    return records
+
+
+def add_records(records: list[dict]):
+    """Merge records handed back by a worker process."""
+    for incoming in records:
+        key = (incoming["stage"], incoming["asset"])
+        record = _records.setdefault(key, {**incoming, "wall": 0.0, "cpu": 0.0, "calls": 0,
+                                           "peakRssMB": 0.0})
+        record["wall"] += incoming["wall"]
+        record["cpu"] += incoming["cpu"]
+        record["calls"] += incoming["calls"]
+        record["peakRssMB"] = max(record["peakRssMB"], incoming["peakRssMB"])
+
+
+def run_profiled(fn, item, name: str, enabled: bool):
+    """Pool worker wrapper: fn(item) profiled as asset name.
+
+    Returns (result, records) for just this call. enabled is passed
+    explicitly because a spawned worker (the default on macOS) doesn't
+    inherit enable(); a forked one does inherit the parent's records, which
+    are set aside here so they aren't reported twice.
+    """
+    enable(enabled)
+    earlier = take_records()
+    try:
+        with asset(name):
+            result = fn(item)
+        return result, take_records()
+    finally:
+        # In-process calls share the parent's records; put them back
+        add_records(earlier)
+
+
+def stage_totals(records: list[dict]) -> dict[str, dict]:
+    """Wall/CPU time and calls per stage, summed over assets."""
+    totals: dict[str, dict] = {}
+    for record in records:
+        total = totals.setdefault(record["stage"], {"wall": 0.0, "cpu": 0.0, "calls": 0})
+        total["wall"] += record["wall"]
+        total["cpu"] += record["cpu"]
+        total["calls"] += record["calls"]
+    return dict(sorted(totals.items(), key=lambda item: -item[1]["wall"]))
+
+
+def report(path: Path, elapsed: float, top: int = TOP_N):
+    """Print the per-stage summary and the slowest assets, and write JSON to path."""
+    records = sorted(take_records(), key=lambda r: -r["wall"])
+    totals = stage_totals(records)
+
+    print(f"\nProfile ({elapsed:.2f}s wall, peak RSS {peak_rss_mb():.0f} MB):")
+    print(f"  {'stage':14s} {'wall s':>8s} {'cpu s':>8s} {'calls':>7s}")
+    for name, total in totals.items():
+        print(f"  {name:14s} {total['wall']:8.2f} {total['cpu']:8.2f} {total['calls']:7d}")
+
+    slowest = [r for r in records if r["asset"]][:top]
+    if slowest:
+        print(f"\n  Slowest {len(slowest)}:")
+        for r in slowest:
+            print(f"  {r['wall']:8.3f}s  {r['stage']:10s} {r['asset']}"
+                  f"  (cpu {r['cpu']:.3f}s, peak {r['peakRssMB']:.0f} MB)")
+
+    profile = {
+        "script": Path(sys.argv[0]).name,
+        "argv": sys.argv[1:],
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "elapsed": round(elapsed, 4),
+        "peakRssMB": round(peak_rss_mb(), 1),
+        "stages": {name: {k: round(v, 4) for k, v in total.items()}
+                   for name, total in totals.items()},
+        "records": [{k: round(v, 4) if isinstance(v, float) else v for k, v in r.items()}
+                    for r in records],
+    }
+    path.write_text(json.dumps(profile, indent=2) + "\n")
+    print(f"\nProfile written to {path}")
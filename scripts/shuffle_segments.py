@@ -4,14 +4,121 @@ Used by sound-check.py to break multi-event sound files (e.g. multiple farts
 in one recording) into individual segments for shuffle playback.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
+import numpy as np
+
+from audio_decode import DecodedAudio, load_audio, slice_ms, write_wav
+
+# Segment files are written concurrently; writing is I/O bound, so threads
+# suffice and share the source buffer without copying it.
+WRITE_WORKERS = 4
+
+
+def _window_rms(audio: DecodedAudio, window_ms: int) -> np.ndarray:
+    """RMS of every window_ms-long window starting at each whole millisecond.
+
+    Mirrors pydub's per-window AudioSegment[i:i + window_ms].rms: frame
+    boundaries truncate ms * rate / 1000, channels are pooled (RMS over all
+    interleaved samples), windows running past the end are padded with
+    silence, and integer PCM gets audioop's truncated integer RMS. Instead
+    of re-scanning each window, one cumulative sum of squared samples turns
+    every window's energy into a single subtraction.
+    """
+    samples = audio.samples
+    if samples.dtype == np.uint8:
+        # 8-bit WAV is unsigned; center it so silence is 0
+        samples = samples.astype(np.int16) - 128
+    # Integer squares summed in int64 are exact for 8/16-bit audio
+    exact = samples.dtype.kind in "iu" and samples.dtype.itemsize <= 2
+    acc = np.int64 if exact else np.float64
+    frame_energy = np.square(samples, dtype=acc).sum(axis=1, dtype=acc)
+
+    starts_ms = np.arange(audio.duration_ms - window_ms + 1)
+    per_ms = audio.frame_rate / 1000.0
+    start = (starts_ms * per_ms).astype(np.int64)
+    end = ((starts_ms + window_ms) * per_ms).astype(np.int64)
+
+    # Missing trailing frames count as silence, as pydub pads them
+    cumulative = np.zeros(max(len(frame_energy), end[-1]) + 1, dtype=acc)
+    np.cumsum(frame_energy, out=cumulative[1:len(frame_energy) + 1])
+    cumulative[len(frame_energy) + 1:] = cumulative[len(frame_energy)]
+
+    counts = (end - start) * audio.channels
+    means = np.divide(
+        (cumulative[end] - cumulative[start]).astype(np.float64), counts,
+        out=np.zeros(len(counts)), where=counts > 0,
+    )
+    rms = np.sqrt(means)
+    if samples.dtype.kind in "iu":
+        rms = np.floor(rms)
+    return rms
+
+
+def detect_silence(audio: DecodedAudio, min_silence_len=1000, silence_thresh=-16):
+    """Silent [start_ms, end_ms] ranges, as pydub.silence.detect_silence.
+
+    A window of min_silence_len ms is silent if its RMS is at or below
+    silence_thresh dBFS. Silent windows starting within min_silence_len of
+    each other are merged (so a brief blip can't split one silence in two),
+    and each range ends min_silence_len after its last silent window start.
+    """
+    if audio.duration_ms < min_silence_len:
+        return []
+
+    if audio.samples.dtype.kind == "f":
+        full_scale = 1.0
+    else:
+        full_scale = 2 ** (8 * audio.samples.dtype.itemsize) / 2
+    threshold = 10 ** (silence_thresh / 20) * full_scale
+
+    silence_starts = np.flatnonzero(_window_rms(audio, min_silence_len) <= threshold)
+    if len(silence_starts) == 0:
+        return []
+
+    # A new range begins wherever the next silent window starts more than
+    # one window length after the previous one
+    breaks = np.flatnonzero(np.diff(silence_starts) > min_silence_len)
+    range_starts = silence_starts[np.concatenate(([0], breaks + 1))]
+    range_ends = silence_starts[np.concatenate((breaks, [len(silence_starts) - 1]))]
+    return [[int(s), int(e) + min_silence_len] for s, e in zip(range_starts, range_ends)]
+
+
+def detect_nonsilent(audio: DecodedAudio, min_silence_len=1000, silence_thresh=-16):
+    """Non-silent [start_ms, end_ms] ranges, as pydub.silence.detect_nonsilent.
+
+    Vectorized over a decoded buffer: pydub computes dBFS one millisecond
+    step at a time in Python, which dominates on recordings minutes long.
+    """
+    silent_ranges = detect_silence(audio, min_silence_len, silence_thresh)
+    len_seg = audio.duration_ms
+
+    # if there is no silence, the whole thing is nonsilent
+    if not silent_ranges:
+        return [[0, len_seg]]
+
+    # short circuit when the whole audio segment is silent
+    if silent_ranges[0][0] == 0 and silent_ranges[0][1] == len_seg:
+        return []
+
+    prev_end_i = 0
+    nonsilent_ranges = []
+    for start_i, end_i in silent_ranges:
+        nonsilent_ranges.append([prev_end_i, start_i])
+        prev_end_i = end_i
+
+    if end_i != len_seg:
+        nonsilent_ranges.append([prev_end_i, len_seg])
+
+    if nonsilent_ranges[0] == [0, 0]:
+        nonsilent_ranges.pop(0)
+
+    return nonsilent_ranges
 
 
 def split_segments(
-    audio_path,
+    audio,
     output_dir,
     base_name,
     silence_thresh=-40,
@@ -19,12 +126,22 @@ def split_segments(
     padding_ms=50,
     min_segment_ms=100,
 ):
-    """Split an audio file at silence boundaries and export segments as WAV.
+    """Split audio at silence boundaries and export segments as WAV.
+
+    audio is a file path or an already-decoded DecodedAudio, so a caller
+    that has the samples in memory doesn't pay for a second decode.
 
-    Returns a list of Path objects for the exported segment files.
+    Each segment is written straight from a view of the source buffer —
+    no per-segment copies — so peak memory doesn't grow with the number of
+    segments. Files are written concurrently and atomically.
+
+    Returns a list of (path, samples) pairs for the exported segment files,
+    where samples is the DecodedAudio view that was written — e.g. for
+    computing segment waveforms without reading the files back.
     Segments shorter than min_segment_ms are discarded.
     """
-    audio = AudioSegment.from_file(str(audio_path))
+    if not isinstance(audio, DecodedAudio):
+        audio = load_audio(audio)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -41,15 +158,17 @@ def split_segments(
     for i, (start_ms, end_ms) in enumerate(ranges):
         # Add padding around each segment boundary
         seg_start = max(0, start_ms - padding_ms)
-        seg_end = min(len(audio), end_ms + padding_ms)
+        seg_end = min(audio.duration_ms, end_ms + padding_ms)
 
         if (seg_end - seg_start) < min_segment_ms:
             continue
 
-        segment = audio[seg_start:seg_end]
         filename = f"shuffle_{base_name}_{i:02d}.wav"
-        out_path = output_dir / filename
-        segment.export(str(out_path), format="wav")
-        exported.append(out_path)
+        exported.append((output_dir / filename, slice_ms(audio, seg_start, seg_end)))
+
+    if exported:
+        with ThreadPoolExecutor(max_workers=min(WRITE_WORKERS, len(exported))) as pool:
+            # list() surfaces the first write error, if any
+            list(pool.map(lambda job: write_wav(*job), exported))
 
     return exported
@@ -13,27 +13,51 @@ Supported formats (playable by AVAudioPlayer on macOS 12+):
 Unsupported formats that will be converted to .wav:
   .flac, .ogg, .wma, .opus
 
+Each sound and shuffle segment also gets a waveform pyramid (RMS and peak
+levels from 512 bars down to 8, see waveform_samples.py), so the app can
+draw a waveform at any width. Waveforms and pyramids are cached by file
+content hash, so unchanged audio is never decoded again on later runs.
+
 Usage:
     cd buttsss/
     python3 sound-check.py            # scan, convert, update manifest
     python3 sound-check.py --dry-run  # show what would happen without changes
+    python3 sound-check.py --force    # ignore the waveform cache, recompute all
+    python3 sound-check.py --jobs 8   # convert and analyze 8 files at a time
+    python3 sound-check.py --profile  # per-stage timing report + .sound-profile.json
+    python3 sound-check.py --watch    # keep running, resync as sounds are saved
+    python3 sound-check.py --split-only  # just convert and split shuffle sources (see build-assets.py)
 """
 
+import argparse
+import hashlib
 import json
+import os
 import re
 import shutil
 import subprocess
 import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+import profiling
+import watching
+from audio_decode import load_audio
+from binary_manifest import encode_sounds, write_if_changed
+from profiling import stage
 from shuffle_segments import split_segments
-from waveform_samples import compute_waveform
+from waveform_samples import PYRAMID_MAX_BARS, PYRAMID_MIN_BARS, WAVEFORM_VERSION, analyze
 
 # -- Configuration ----------------------------------------------------------
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 SOUNDS_DIR = SCRIPT_DIR.parent / "sounds"
 MANIFEST_PATH = SOUNDS_DIR / "sounds-manifest.json"
+# Compact form of the manifest that the app reads (see binary_manifest.py)
+BINARY_MANIFEST_PATH = SOUNDS_DIR / "sounds-manifest.bin"
 
 SUPPORTED_EXTENSIONS = {".wav", ".mp3", ".m4a", ".aiff"}
 CONVERTIBLE_EXTENSIONS = {".flac", ".ogg", ".wma", ".opus"}
@@ -43,12 +67,22 @@ DEFAULT_CATEGORY = "uncategorized"
 SHUFFLE_PREFIX = "shuffle_"
 SHUFFLE_SOURCES_DIR = SCRIPT_DIR / "shuffle-sources"
 
+WAVEFORM_BARS = 25  # must match Layout.waveformBarCount in Constants.swift
+WAVEFORM_CACHE_PATH = SCRIPT_DIR / ".waveform-cache.json"
+# Manifest fields computed from the audio, per sound and per segment
+WAVEFORM_FIELDS = {"waveform", "pyramid"}
+PROFILE_PATH = SCRIPT_DIR / ".sound-profile.json"
+
 # Segment files: shuffle_<name>_NN.ext (two trailing digits after last underscore)
 SEGMENT_PATTERN = re.compile(r"^shuffle_.+_\d{2}$")
 
 
 # -- Helpers ----------------------------------------------------------------
 
+class SyncError(Exception):
+    """A problem that stops a sync; reported without a traceback."""
+
+
 def slugify(filename: str) -> str:
     """Turn an audio filename into a clean identifier.
 
@@ -89,17 +123,23 @@ def has_ffmpeg() -> bool:
         return False
 
 
-def convert_to_wav(source: Path) -> Path:
-    """Convert an unsupported audio file to WAV using ffmpeg."""
+def convert_to_wav(source: Path) -> Path | None:
+    """Convert an unsupported audio file to WAV using ffmpeg.
+
+    Returns the new WAV, or None if ffmpeg failed (the original is kept).
+    """
     target = source.with_suffix(".wav")
     print(f"  Converting {source.name} -> {target.name}")
-    result = subprocess.run(
-        ["ffmpeg", "-y", "-i", str(source), str(target)],
-        capture_output=True, text=True,
-    )
+    with stage("convert"):
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-i", str(source), str(target)],
+            capture_output=True, text=True,
+        )
     if result.returncode != 0:
         print(f"  ERROR converting {source.name}: {result.stderr}", file=sys.stderr)
-        return source
+        # Don't leave a half-written WAV to be picked up as a sound
+        target.unlink(missing_ok=True)
+        return None
     # Remove the original unsupported file
     source.unlink()
     print(f"  Removed original {source.name}")
@@ -117,6 +157,172 @@ def load_manifest() -> list[dict]:
     return []
 
 
+# Digests by (path, mtime, size), so a --watch resync only re-reads files
+# that changed since the last pass
+_digests: dict[tuple[Path, int, int], str] = {}
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 hex digest of a file's contents."""
+    st = path.stat()
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key not in _digests:
+        _digests[key] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return _digests[key]
+
+
+def waveform_params() -> dict:
+    """Everything besides the audio itself that affects a waveform."""
+    return {
+        "version": WAVEFORM_VERSION, "bars": WAVEFORM_BARS,
+        "pyramid": [PYRAMID_MAX_BARS, PYRAMID_MIN_BARS],
+    }
+
+
+def load_waveform_cache() -> dict[str, dict]:
+    """Load cached waveforms and pyramids keyed by audio content hash.
+
+    Returns {} if the cache is missing, unreadable, or was written with
+    different bar counts or waveform algorithm version.
+    """
+    if not WAVEFORM_CACHE_PATH.exists():
+        return {}
+    try:
+        cache = json.loads(WAVEFORM_CACHE_PATH.read_text())
+    except (json.JSONDecodeError, ValueError):
+        print("  WARNING: Could not parse waveform cache, recomputing all",
+              file=sys.stderr)
+        return {}
+    if cache.get("params") != waveform_params():
+        return {}
+    return cache.get("waveforms", {})
+
+
+def save_waveform_cache(waveforms: dict[str, dict]):
+    """Write the waveforms used in this run as the new cache."""
+    cache = {"params": waveform_params(), "waveforms": dict(sorted(waveforms.items()))}
+    WAVEFORM_CACHE_PATH.write_text(json.dumps(cache) + "\n")
+
+
+def run_jobs(fn: Callable, paths: list[Path], jobs: int) -> list:
+    """Apply fn to every path, in a process pool when jobs > 1.
+
+    Results come back in the same order as paths, so everything built from
+    them is deterministic. A failure is reported against its file and
+    yields None, so one bad file doesn't stop the rest.
+    """
+    def report(path: Path, e: Exception):
+        print(f"  ERROR processing {path.name}: {e}", file=sys.stderr)
+
+    # With --profile, each file's stage timings come back with its result
+    profile = profiling.is_enabled()
+
+    def collect(result_and_records):
+        result, records = result_and_records
+        profiling.add_records(records)
+        return result
+
+    results = []
+    if jobs <= 1:
+        for path in paths:
+            try:
+                results.append(collect(profiling.run_profiled(fn, path, path.name, profile)))
+            except Exception as e:
+                report(path, e)
+                results.append(None)
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(profiling.run_profiled, fn, path, path.name, profile) for path in paths
+        ]
+        for path, future in zip(paths, futures):
+            try:
+                results.append(collect(future.result()))
+            except Exception as e:
+                report(path, e)
+                results.append(None)
+    return results
+
+
+def waveform_fields(audio) -> dict:
+    """The manifest's "waveform" and "pyramid" for audio, in one pass over it."""
+    waveform, pyramid = analyze(audio, WAVEFORM_BARS)
+    return {"waveform": waveform, "pyramid": pyramid}
+
+
+def waveform_for(audio_path: Path) -> dict:
+    """Pool worker: the manifest waveform and pyramid for one file."""
+    with stage("decode"):
+        audio = load_audio(audio_path)
+    with stage("waveform"):
+        return waveform_fields(audio)
+
+
+def resolve_waveforms(
+    paths: list[Path], cache: dict, used: dict, jobs: int,
+) -> tuple[dict[Path, dict | None], int]:
+    """Waveforms and pyramids for paths, computing only content not already cached.
+
+    Keyed by content hash, so renames and manifest edits don't invalidate
+    anything. Every waveform handed out is recorded in used, which becomes
+    the next cache (dropping entries for audio that no longer exists).
+    Returns ({path: waveform fields, or None if it failed}, number computed).
+    """
+    with stage("hash"):
+        digests = {path: hash_file(path) for path in paths}
+    misses = []
+    for path in paths:
+        if digests[path] not in cache and path not in misses:
+            misses.append(path)
+
+    computed = {}
+    for path, waveform in zip(misses, run_jobs(waveform_for, misses, jobs)):
+        if waveform is not None:
+            computed[digests[path]] = waveform
+
+    waveforms = {}
+    for path in paths:
+        waveform = cache.get(digests[path], computed.get(digests[path]))
+        if waveform is not None:
+            used[digests[path]] = waveform
+        waveforms[path] = waveform
+    return waveforms, len(computed)
+
+
+def process_shuffle_source(sf: Path) -> dict:
+    """Pool worker: waveform, pyramid and segments for one shuffle source.
+
+    The file is decoded once: the source waveform, the split and every
+    segment waveform all work from that one buffer. Segment waveforms come
+    from slices of it rather than re-reading the exported files.
+    """
+    # The "raw name" is the filename without the shuffle_ prefix
+    raw_name = sf.stem[len(SHUFFLE_PREFIX):]
+    with stage("decode"):
+        audio = load_audio(sf)
+
+    # Compute waveform from the original BEFORE splitting
+    with stage("waveform"):
+        fields = waveform_fields(audio)
+    with stage("split"):
+        split = split_segments(audio, SOUNDS_DIR, raw_name)
+    with stage("waveform"):
+        segments = [(seg_path, waveform_fields(seg_audio)) for seg_path, seg_audio in split]
+    return {
+        **fields,
+        "segments": segments,
+        "original_ext": sf.suffix.lstrip("."),
+    }
+
+
+def shuffle_source_path(entry: dict) -> Path | None:
+    """Where a shuffle entry's original file was moved to, if it names one."""
+    if not entry.get("source"):
+        return None
+    return SHUFFLE_SOURCES_DIR / f"{SHUFFLE_PREFIX}{entry['source']}"
+
+
 def scan_audio_files() -> list[Path]:
     """Find all audio files in the sounds directory."""
     files = []
@@ -126,87 +332,166 @@ def scan_audio_files() -> list[Path]:
     return files
 
 
-# -- Main -------------------------------------------------------------------
+def is_shuffle_source(path: Path) -> bool:
+    """shuffle_<name>.ext, as opposed to one of its shuffle_<name>_NN.ext segments."""
+    return path.stem.startswith(SHUFFLE_PREFIX) and not is_segment_file(path)
 
-def main():
-    dry_run = "--dry-run" in sys.argv
 
-    if not SOUNDS_DIR.exists():
-        print(f"Sounds directory not found: {SOUNDS_DIR}", file=sys.stderr)
-        sys.exit(1)
+def require_ffmpeg():
+    if not has_ffmpeg():
+        raise SyncError("ffmpeg is required to convert unsupported formats "
+                        "(install with: brew install ffmpeg)")
 
-    # Step 1: Find audio files
-    audio_files = scan_audio_files()
-    print(f"Found {len(audio_files)} audio file(s) in {SOUNDS_DIR}")
 
-    if not audio_files:
-        print("Nothing to do.")
-        return
-
-    # Step 2: Convert unsupported formats
-    needs_conversion = [f for f in audio_files if f.suffix.lower() in CONVERTIBLE_EXTENSIONS]
-    if needs_conversion:
-        if not has_ffmpeg():
-            print("ERROR: ffmpeg is required to convert unsupported formats.", file=sys.stderr)
-            print("  Install with: brew install ffmpeg", file=sys.stderr)
-            sys.exit(1)
+def convert_files(files: list[Path], jobs: int) -> tuple[dict[Path, Path], list[Path]]:
+    """Convert files to WAV. Returns ({original: WAV}, files that failed)."""
+    converted = run_jobs(convert_to_wav, files, jobs)
+    renamed = {src: dst for src, dst in zip(files, converted) if dst}
+    # Files that failed to convert can't be played, so they get no entry
+    failed = [f for f in files if f not in renamed]
+    if failed:
+        print(f"  {len(failed)} file(s) not converted, skipped: "
+              f"{', '.join(f.name for f in failed)}", file=sys.stderr)
+    return renamed, failed
 
-        print(f"\n{len(needs_conversion)} file(s) need conversion:")
-        for f in needs_conversion:
-            if dry_run:
-                print(f"  [dry-run] Would convert {f.name} -> {f.stem}.wav")
-            else:
-                convert_to_wav(f)
 
-    # Re-scan after conversions
-    if not dry_run:
-        audio_files = scan_audio_files()
+def split_shuffle_sources(
+    sources: list[Path], jobs: int, strict: bool = False,
+) -> tuple[dict[str, dict], list[Path]]:
+    """Analyze and split shuffle sources, then move each original to shuffle-sources/.
 
-    # Step 3: Identify shuffle source files (not segments) and split
-    # Shuffle sources: shuffle_<name>.ext, NOT matching shuffle_<name>_NN.ext
-    shuffle_sources = [
-        f for f in audio_files
-        if f.stem.startswith(SHUFFLE_PREFIX) and not is_segment_file(f)
-    ]
-    # Map from the original name (without shuffle_ prefix) to waveform + segments
+    A source that fails is left where it is. With strict, any failure
+    raises SyncError before a single original is moved, since a moved
+    source with no manifest entry would never be picked up again.
+    Returns ({raw name: process_shuffle_source result}, paths written in
+    sounds/: the moved originals and their new segments).
+    """
     shuffle_data: dict[str, dict] = {}
+    written: list[Path] = []
+    results = run_jobs(process_shuffle_source, sources, jobs)
+    failed = [sf for sf, data in zip(sources, results) if data is None]
+    if strict and failed:
+        raise analysis_failed(failed)
+    for sf, data in zip(sources, results):
+        print(f"  {sf.name}")
+        if data is None:
+            continue
+        print(f"  Computed waveform ({len(data['waveform'])} bars)")
+        print(f"  Split into {len(data['segments'])} segment(s)")
+        shuffle_data[sf.stem[len(SHUFFLE_PREFIX):]] = data
+
+        # Move original to shuffle-sources/
+        SHUFFLE_SOURCES_DIR.mkdir(parents=True, exist_ok=True)
+        dest = SHUFFLE_SOURCES_DIR / sf.name
+        shutil.move(str(sf), str(dest))
+        print(f"  Moved original to {dest.relative_to(SCRIPT_DIR.parent)}")
+        written.append(sf)
+        written.extend(p for p, _ in data["segments"])
+    return shuffle_data, written
+
+
+def analysis_failed(paths: list[Path]) -> SyncError:
+    return SyncError(
+        f"could not analyze {', '.join(p.name for p in paths)}; manifest not written "
+        f"(fix or remove the file(s) and run again)"
+    )
 
-    if shuffle_sources:
-        print(f"\n{len(shuffle_sources)} shuffle source file(s) found:")
-        for sf in shuffle_sources:
-            print(f"  {sf.name}")
-            # The "raw name" is the filename without the shuffle_ prefix
-            raw_name = sf.stem[len(SHUFFLE_PREFIX):]
 
-            if dry_run:
-                print(f"  [dry-run] Would compute waveform and split {sf.name}")
-                continue
+def shuffle_entry(raw_name: str, data: dict, existing_by_file: dict[str, dict]) -> tuple[dict, bool]:
+    """Manifest entry for a newly split shuffle sound, and whether it's new.
 
-            # Compute waveform from the original BEFORE splitting
-            waveform = compute_waveform(sf)
-            print(f"  Computed waveform ({len(waveform)} bars)")
+    Name, id and category come from the entry the sound had before it was
+    renamed to shuffle_*, if there was one.
+    """
+    original_ext = data["original_ext"]
+    prev = (
+        existing_by_file.get(f"{raw_name}.{original_ext}")
+        or existing_by_file.get(f"{raw_name}.wav")
+        or existing_by_file.get(f"{raw_name}.mp3")
+    )
+    segments_list = []
+    for seg_path, seg_fields in data["segments"]:
+        segments_list.append({
+            "file": seg_path.stem,
+            "ext": seg_path.suffix.lstrip("."),
+            **seg_fields,
+        })
+    entry = {
+        "id": prev["id"] if prev else slugify(raw_name),
+        "name": prev["name"] if prev else display_name(raw_name),
+        "category": prev["category"] if prev else DEFAULT_CATEGORY,
+        "shuffle": True,
+        "source": f"{raw_name}.{original_ext}",
+        "waveform": data["waveform"],
+        "pyramid": data["pyramid"],
+        "segments": segments_list,
+    }
+    return entry, prev is None
+
+
+def new_entry(audio_path: Path) -> dict:
+    """Default manifest entry for a sound that isn't in the manifest yet."""
+    return {
+        "id": slugify(audio_path.name),
+        "name": display_name(audio_path.name),
+        "category": DEFAULT_CATEGORY,
+        "file": audio_path.stem,
+        "ext": audio_path.suffix.lstrip("."),
+    }
+
+
+def write_manifest(manifest: list[dict]):
+    """Write sounds-manifest.json and its binary form, sorted by category then id.
+
+    Either file is left untouched if its contents didn't change, so a
+    sync that changes nothing doesn't bump mtimes (and make Xcode recopy
+    the resources, or build-assets.py think the outputs were edited).
+    """
+    manifest.sort(key=lambda e: (e["category"].lower(), e["id"]))
+    with stage("manifest"):
+        write_if_changed(MANIFEST_PATH, (json.dumps(manifest, indent=2) + "\n").encode())
+        write_if_changed(BINARY_MANIFEST_PATH, encode_sounds(manifest))
 
-            # Split into segments
-            segments = split_segments(sf, SOUNDS_DIR, raw_name)
-            print(f"  Split into {len(segments)} segment(s)")
 
-            shuffle_data[raw_name] = {
-                "waveform": waveform,
-                "segments": segments,
-                "original_ext": sf.suffix.lstrip("."),
-            }
+# -- Main -------------------------------------------------------------------
 
-            # Move original to shuffle-sources/
-            SHUFFLE_SOURCES_DIR.mkdir(parents=True, exist_ok=True)
-            dest = SHUFFLE_SOURCES_DIR / sf.name
-            shutil.move(str(sf), str(dest))
-            print(f"  Moved original to {dest.relative_to(SCRIPT_DIR.parent)}")
+def sync(dry_run: bool, jobs: int, force: bool = False) -> list[Path]:
+    """Bring sounds/ and the manifest up to date; the whole pipeline, once.
 
-    # Re-scan after splitting (now has segments, not originals)
-    if not dry_run:
+    With force, the waveform cache is ignored and every waveform recomputed.
+
+    Returns the paths it created, moved or deleted in sounds/ (converted
+    files, shuffle sources and their segments), so --watch doesn't take
+    its own work for new changes.
+    """
+    written: list[Path] = []
+
+    # Step 1: Find audio files
+    with stage("scan"):
         audio_files = scan_audio_files()
+    print(f"Found {len(audio_files)} audio file(s) in {SOUNDS_DIR}")
 
-    # Step 4: Load existing manifest and build lookups
+    if not audio_files:
+        print("Nothing to do.")
+        return []
+
+    # Step 2: Convert unsupported formats
+    needs_conversion = [f for f in audio_files if f.suffix.lower() in CONVERTIBLE_EXTENSIONS]
+    if needs_conversion:
+        require_ffmpeg()
+        print(f"\n{len(needs_conversion)} file(s) need conversion:")
+        if dry_run:
+            for f in needs_conversion:
+                print(f"  [dry-run] Would convert {f.name} -> {f.stem}.wav")
+        else:
+            # Track the renames instead of re-scanning the directory
+            renamed, failed = convert_files(needs_conversion, jobs)
+            written.extend(p for pair in renamed.items() for p in pair)
+            audio_files = sorted({renamed.get(f, f) for f in audio_files if f not in failed})
+
+    # Step 3: Load existing manifest, waveform cache, and build lookups
+    waveform_cache = {} if force else load_waveform_cache()
+    used_waveforms: dict[str, dict] = {}
     existing = load_manifest()
     # Key by "file.ext" for regular sounds (those with file/ext fields)
     existing_by_file: dict[str, dict] = {}
@@ -217,98 +502,95 @@ def main():
             existing_by_file[key] = entry
         existing_by_id[entry["id"]] = entry
 
+    # Regular (non-shuffle, non-segment) audio files; the split below
+    # only adds segments, so this list is already final
+    regular_files = [f for f in audio_files if not f.stem.startswith(SHUFFLE_PREFIX)]
+    # Carried-forward shuffle sounds and segments that still lack a
+    # waveform or pyramid (sources are read from shuffle-sources/)
+    backfill = []
+    for entry in existing:
+        if not entry.get("shuffle"):
+            continue
+        if not WAVEFORM_FIELDS <= entry.keys() and shuffle_source_path(entry):
+            backfill.append(shuffle_source_path(entry))
+        backfill.extend(
+            SOUNDS_DIR / f"{seg['file']}.{seg['ext']}"
+            for seg in entry.get("segments") or [] if not WAVEFORM_FIELDS <= seg.keys()
+        )
+    backfill = [p for p in backfill if p.exists()]
+
+    # Compute every needed waveform up front (cache misses only, in
+    # parallel), before any shuffle source is moved. A sound that can't be
+    # analyzed stops the sync rather than getting an entry without one.
+    waveforms: dict[Path, dict | None] = {}
+    computed_count = 0
+    if not dry_run:
+        waveforms, computed_count = resolve_waveforms(
+            regular_files + backfill, waveform_cache, used_waveforms, jobs)
+        failed = [path for path, fields in waveforms.items() if fields is None]
+        if failed:
+            raise analysis_failed(failed)
+
+    # Step 4: Identify shuffle source files (not segments) and split
+    # Shuffle sources: shuffle_<name>.ext, NOT matching shuffle_<name>_NN.ext
+    shuffle_sources = [f for f in audio_files if is_shuffle_source(f)]
+    # Map from the original name (without shuffle_ prefix) to waveform + segments
+    shuffle_data: dict[str, dict] = {}
+
+    if shuffle_sources:
+        print(f"\n{len(shuffle_sources)} shuffle source file(s) found:")
+        if dry_run:
+            for sf in shuffle_sources:
+                print(f"  {sf.name}")
+                print(f"  [dry-run] Would compute waveform and split {sf.name}")
+        else:
+            shuffle_data, moved = split_shuffle_sources(shuffle_sources, jobs, strict=True)
+            written.extend(moved)
+
     # Step 5: Build new manifest
     manifest = []
     new_count = 0
 
-    # Collect all segment filenames to exclude from regular entries
-    segment_filenames: set[str] = set()
-    for f in audio_files:
-        if is_segment_file(f):
-            segment_filenames.add(f.name)
-
     # 5a: Add entries for newly-split shuffle sounds
     for raw_name, data in shuffle_data.items():
-        original_ext = data["original_ext"]
-        # Look up the pre-existing manifest entry by the original filename
-        # (before it was renamed to shuffle_*)
-        prev = (
-            existing_by_file.get(f"{raw_name}.{original_ext}")
-            or existing_by_file.get(f"{raw_name}.wav")
-            or existing_by_file.get(f"{raw_name}.mp3")
-        )
-
-        segments_list = []
-        for seg_path in data["segments"]:
-            seg_waveform = compute_waveform(seg_path)
-            segments_list.append({
-                "file": seg_path.stem,
-                "ext": seg_path.suffix.lstrip("."),
-                "waveform": seg_waveform,
-            })
-
-        entry = {
-            "id": prev["id"] if prev else slugify(raw_name),
-            "name": prev["name"] if prev else display_name(raw_name),
-            "category": prev["category"] if prev else DEFAULT_CATEGORY,
-            "shuffle": True,
-            "source": f"{raw_name}.{original_ext}",
-            "waveform": data["waveform"],
-            "segments": segments_list,
-        }
+        entry, is_new = shuffle_entry(raw_name, data, existing_by_file)
         manifest.append(entry)
-        if not prev:
+        if is_new:
             new_count += 1
 
     # 5b: Carry forward existing shuffle entries that weren't re-processed
     new_shuffle_ids = {e["id"] for e in manifest}
     for entry in existing:
         if entry.get("shuffle") and entry["id"] not in new_shuffle_ids:
-            # Backfill per-segment waveforms for entries that lack them
-            if entry.get("segments"):
-                for seg in entry["segments"]:
-                    if "waveform" not in seg:
-                        seg_path = SOUNDS_DIR / f"{seg['file']}.{seg['ext']}"
-                        if seg_path.exists() and not dry_run:
-                            seg["waveform"] = compute_waveform(seg_path)
+            # Backfill a waveform or pyramid where an entry lacks one,
+            # leaving the fields it already has untouched
+            source_path = shuffle_source_path(entry)
+            if waveforms.get(source_path) is not None:
+                for key, value in waveforms[source_path].items():
+                    entry.setdefault(key, value)
+            for seg in entry.get("segments") or []:
+                seg_path = SOUNDS_DIR / f"{seg['file']}.{seg['ext']}"
+                if waveforms.get(seg_path) is not None:
+                    for key, value in waveforms[seg_path].items():
+                        seg.setdefault(key, value)
             manifest.append(entry)
 
     # 5c: Add regular (non-shuffle, non-segment) audio files
-    for audio_path in audio_files:
-        if audio_path.name == "sounds-manifest.json":
-            continue
-        if audio_path.name in segment_filenames:
-            continue
-        if audio_path.stem.startswith(SHUFFLE_PREFIX):
-            continue
-
-        filename = audio_path.stem
-        ext = audio_path.suffix.lstrip(".")
-        file_key = f"{filename}.{ext}"
-
-        if file_key in existing_by_file:
-            entry = dict(existing_by_file[file_key])
+    for audio_path in regular_files:
+        if audio_path.name in existing_by_file:
+            entry = dict(existing_by_file[audio_path.name])
         else:
-            entry = {
-                "id": slugify(audio_path.name),
-                "name": display_name(audio_path.name),
-                "category": DEFAULT_CATEGORY,
-                "file": filename,
-                "ext": ext,
-            }
+            entry = new_entry(audio_path)
             new_count += 1
             if dry_run:
-                print(f"  [dry-run] Would add: {entry['id']} ({file_key})")
+                print(f"  [dry-run] Would add: {entry['id']} ({audio_path.name})")
 
-        # Compute waveform for regular sounds
-        if not dry_run:
-            entry["waveform"] = compute_waveform(audio_path)
+        # Waveform and pyramid for regular sounds (none yet in a dry run)
+        if waveforms.get(audio_path) is not None:
+            entry.update(waveforms[audio_path])
 
         manifest.append(entry)
 
-    # Sort by category then id
-    manifest.sort(key=lambda e: (e["category"].lower(), e["id"]))
-
     # Step 6: Check for removed entries
     current_ids = {e["id"] for e in manifest}
     removed = [e for e in existing if e["id"] not in current_ids]
@@ -322,8 +604,11 @@ def main():
         print(f"\n[dry-run] Would write manifest with {len(manifest)} entries "
               f"({new_count} new)")
     else:
-        MANIFEST_PATH.write_text(json.dumps(manifest, indent=2) + "\n")
+        write_manifest(manifest)
         print(f"\nManifest written: {len(manifest)} sounds ({new_count} new)")
+        save_waveform_cache(used_waveforms)
+        print(f"Waveforms: {len(used_waveforms) - computed_count} cached, "
+              f"{computed_count} computed")
 
     # Summary
     print(f"\n{'=' * 50}")
@@ -345,6 +630,160 @@ def main():
         print(f"\n  {new_count} new sound(s) added with category '{DEFAULT_CATEGORY}'.")
         print("  Edit sounds-manifest.json to set names and categories.")
 
+    return written
+
+
+def resync_changed(changed: list[Path], jobs: int) -> list[Path]:
+    """--watch handler: process just the changed files and patch the manifest.
+
+    Nothing else in sounds/ is scanned, hashed or decoded. Changed sounds
+    and segments get their waveform and pyramid recomputed, new sounds get
+    an entry, deleted sounds lose theirs, and new shuffle_* sources are
+    split as in sync(). A file that fails to analyze keeps its previous
+    fields (or gets no entry yet) until a good save. Returns the paths it
+    wrote, like sync().
+    """
+    written: list[Path] = []
+    present = sorted(p for p in changed if p.exists())
+    gone = [p for p in changed if not p.exists()]
+
+    convertible = [p for p in present if p.suffix.lower() in CONVERTIBLE_EXTENSIONS]
+    if convertible:
+        require_ffmpeg()
+        renamed, failed = convert_files(convertible, jobs)
+        written.extend(p for pair in renamed.items() for p in pair)
+        present = sorted({renamed.get(p, p) for p in present if p not in failed})
+
+    manifest = load_manifest()
+    by_file = {f"{e['file']}.{e['ext']}": e for e in manifest if e.get("file") and e.get("ext")}
+
+    # New shuffle sources replace the sound they were renamed from (or an
+    # earlier split of the same source), keeping its name and category
+    sources = [p for p in present if is_shuffle_source(p)]
+    shuffle_data, moved = split_shuffle_sources(sources, jobs)
+    written.extend(moved)
+    for raw_name, data in shuffle_data.items():
+        entry, is_new = shuffle_entry(raw_name, data, by_file)
+        manifest = [e for e in manifest if e["id"] != entry["id"]]
+        manifest.append(entry)
+        print(f"  {'Added' if is_new else 'Updated'} {entry['id']}")
+
+    for path in gone:
+        entry = by_file.get(path.name)
+        if entry is not None and entry in manifest:
+            manifest.remove(entry)
+            print(f"  Removed {entry['id']}")
+
+    segments = {f"{s['file']}.{s['ext']}": s for e in manifest for s in e.get("segments") or []}
+    to_analyze = [
+        p for p in present
+        if p.name in segments or not (is_segment_file(p) or p.stem.startswith(SHUFFLE_PREFIX))
+    ]
+    if to_analyze:
+        # Merged into the cache rather than replacing it; the next full sync prunes it
+        cache = load_waveform_cache()
+        waveforms, _ = resolve_waveforms(to_analyze, cache, cache, jobs)
+        for path in to_analyze:
+            fields = waveforms[path]
+            if fields is None:
+                continue
+            if path.name in segments:
+                segments[path.name].update(fields)
+                print(f"  Updated segment {path.name}")
+            elif by_file.get(path.name) in manifest:
+                by_file[path.name].update(fields)
+                print(f"  Updated {by_file[path.name]['id']}")
+            else:
+                entry = {**new_entry(path), **fields}
+                manifest.append(entry)
+                print(f"  Added {entry['id']} (category '{DEFAULT_CATEGORY}')")
+        save_waveform_cache(cache)
+
+    write_manifest(manifest)
+    return written
+
+
+def split_only(jobs: int):
+    """--split-only: convert unsupported formats and split new shuffle sources.
+
+    The files that need it are handled as resync_changed() would handle
+    them, so the rest of the manifest is left as is.
+    """
+    pending = [
+        f for f in scan_audio_files()
+        if f.suffix.lower() in CONVERTIBLE_EXTENSIONS or is_shuffle_source(f)
+    ]
+    if not pending:
+        print("Nothing to convert or split.")
+        return
+    print(f"{len(pending)} file(s) to convert or split:")
+    resync_changed(pending, jobs)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Manage sound assets and sounds-manifest.json.")
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="show what would happen without changing anything",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="number of worker processes for conversion and analysis "
+             "(0 = one per CPU core, default: 1)",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="ignore the waveform cache and recompute every waveform and pyramid",
+    )
+    parser.add_argument(
+        "--profile", type=Path, nargs="?", const=PROFILE_PATH, default=None, metavar="JSON",
+        help="time every stage per file, print the slowest, and write JSON "
+             f"(default: {PROFILE_PATH.name})",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="after syncing, keep watching sounds/ and resync whenever audio changes",
+    )
+    parser.add_argument(
+        "--split-only", action="store_true",
+        help="only convert unsupported formats and split new shuffle sources; "
+             "other sounds keep their manifest entries as they are",
+    )
+    args = parser.parse_args()
+    if args.watch and args.dry_run:
+        parser.error("--watch can't be combined with --dry-run")
+    if args.split_only and (args.watch or args.dry_run or args.force):
+        parser.error("--split-only can't be combined with --watch, --dry-run or --force")
+    return args
+
+
+def main():
+    args = parse_args()
+    started = time.perf_counter()
+    profiling.enable(args.profile is not None)
+    dry_run = args.dry_run
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    if not SOUNDS_DIR.exists():
+        print(f"Sounds directory not found: {SOUNDS_DIR}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.split_only:
+            split_only(jobs)
+        else:
+            sync(dry_run, jobs, args.force)
+    except SyncError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.profile:
+        profiling.report(args.profile, time.perf_counter() - started)
+
+    if args.watch:
+        profiling.enable(False)
+        watching.watch([SOUNDS_DIR], ALL_AUDIO_EXTENSIONS, partial(resync_changed, jobs=jobs))
+
 
 if __name__ == "__main__":
     main()
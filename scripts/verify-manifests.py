@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Check that the binary manifests decode back to their JSON manifests.
+
+brazilian-butt-lift.py and sound-check.py write ButtFrames/manifest.bin
+and sounds/sounds-manifest.bin whenever they write the JSON; the app reads
+the .bin files. This decodes each .bin and compares it, entry by entry,
+with the fields the JSON manifest has for the app (see binary_manifest.py).
+
+Usage:
+    cd scripts/
+    uv run verify-manifests.py          # exit 1 if a .bin is missing or differs
+    uv run verify-manifests.py --write  # regenerate the .bin files from the JSON first
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from binary_manifest import (
+    BUTT_FIELDS, SOUND_FIELDS, carried, decode_butts, decode_sounds, encode_butts,
+    encode_sounds, write_if_changed,
+)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SCRIPT_DIR.parent
+
+# (JSON manifest, binary manifest, entries of the JSON, encode, decode, fields carried)
+MANIFESTS = [
+    (ROOT_DIR / "ButtFrames" / "manifest.json", ROOT_DIR / "ButtFrames" / "manifest.bin",
+     lambda manifest: manifest["butts"], encode_butts, decode_butts, BUTT_FIELDS),
+    (ROOT_DIR / "sounds" / "sounds-manifest.json", ROOT_DIR / "sounds" / "sounds-manifest.bin",
+     lambda manifest: manifest, encode_sounds, decode_sounds, SOUND_FIELDS),
+]
+
+
+def verify(json_path: Path, bin_path: Path, entries_of, encode, decode, fields, write: bool) -> list[str]:
+    """Problems found comparing one .bin with its JSON manifest."""
+    entries = entries_of(json.loads(json_path.read_text()))
+    if write:
+        write_if_changed(bin_path, encode(entries))
+    if not bin_path.exists():
+        return [f"{bin_path.name} is missing (run with --write)"]
+
+    try:
+        decoded = decode(bin_path.read_bytes())
+    except (ValueError, UnicodeDecodeError, IndexError) as e:
+        return [f"{bin_path.name} can't be decoded: {e}"]
+
+    problems = []
+    expected = [carried(entry, fields) for entry in entries]
+    if len(decoded) != len(expected):
+        problems.append(f"{len(decoded)} entries, JSON has {len(expected)}")
+    for want, got in zip(expected, decoded):
+        if want != got:
+            keys = sorted(k for k in want.keys() | got.keys() if want.get(k) != got.get(k))
+            problems.append(f"{want.get('id')}: {', '.join(keys)} differ")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check binary manifests against their JSON.")
+    parser.add_argument(
+        "--write", action="store_true",
+        help="regenerate the .bin files from the JSON manifests before checking",
+    )
+    args = parser.parse_args()
+
+    failures = 0
+    for json_path, bin_path, *codec in MANIFESTS:
+        problems = verify(json_path, bin_path, *codec, args.write)
+        rel = bin_path.relative_to(ROOT_DIR)
+        if problems:
+            failures += 1
+            print(f"  FAIL  {rel}")
+            for problem in problems:
+                print(f"          {problem}")
+        else:
+            print(f"  OK    {rel}  {bin_path.stat().st_size / 1024:5.1f} KB "
+                  f"(JSON {json_path.stat().st_size / 1024:.1f} KB)")
+
+    if failures:
+        print(f"\n{failures} binary manifest(s) don't match their JSON", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
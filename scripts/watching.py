@@ -0,0 +1,148 @@
+"""Watch source folders and rebuild as files change (--watch).
+
+Used by brazilian-butt-lift.py and sound-check.py. What changed is always
+decided by comparing (mtime, size) snapshots of the watched files, so no
+change can be missed or reported twice. On Linux, inotify (through ctypes,
+no extra dependency) wakes the watcher the moment a file is written;
+elsewhere, including macOS, the folders are polled every POLL_INTERVAL.
+
+A burst of changes (an editor's save-rename dance, a folder of GIFs
+dropped in at once) is debounced into one batch: handle() runs once the
+files have stopped changing for DEBOUNCE seconds.
+"""
+
+import ctypes
+import os
+import select
+import sys
+import time
+import traceback
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+# Seconds the folders must stay unchanged before a batch is handled
+DEBOUNCE = 0.2
+# Seconds between snapshots when inotify isn't available
+POLL_INTERVAL = 0.25
+
+# inotify event mask: anything that creates, rewrites, renames or removes a file
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+
+def snapshot(dirs: list[Path], suffixes: set[str]) -> dict[Path, tuple[int, int]]:
+    """(mtime_ns, size) of every file in dirs with one of suffixes.
+
+    Hidden files are skipped, which also skips the pipelines' own
+    .<name>.tmp files mid-write.
+    """
+    files = {}
+    for folder in dirs:
+        for entry in os.scandir(folder):
+            if entry.name.startswith(".") or Path(entry.name).suffix.lower() not in suffixes:
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.is_file():
+                files[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+def _inotify_fd(dirs: list[Path]) -> int | None:
+    """A non-blocking inotify descriptor watching dirs, or None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    for folder in dirs:
+        if libc.inotify_add_watch(fd, os.fsencode(folder), _IN_MASK) < 0:
+            os.close(fd)
+            return None
+    return fd
+
+
+def _wait(fd: int | None, timeout: float):
+    """Sleep up to timeout, returning early if inotify reports activity."""
+    if fd is None:
+        time.sleep(timeout)
+        return
+    readable, _, _ = select.select([fd], [], [], timeout)
+    if readable:
+        # The events only wake us up; the snapshot says what changed
+        try:
+            while os.read(fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+
+def watch(
+    dirs: list[Path],
+    suffixes: set[str],
+    handle: Callable[[list[Path]], Iterable[Path] | None],
+):
+    """Call handle(changed paths) after every burst of changes, until Ctrl-C.
+
+    changed holds every watched path that was created, modified or deleted
+    since the last batch. handle may return paths it wrote itself inside
+    the watched folders (converted or split files, say); those changes
+    are absorbed rather than fed back in as a new batch. An exception in
+    handle is reported and watching carries on, so one broken save doesn't
+    end the session.
+    """
+    fd = _inotify_fd(dirs)
+    how = "inotify" if fd is not None else f"polling every {POLL_INTERVAL}s"
+    names = ", ".join(str(d) for d in dirs)
+    print(f"\nWatching {names} ({how}); Ctrl-C to stop")
+
+    known = snapshot(dirs, suffixes)
+    try:
+        while True:
+            _wait(fd, POLL_INTERVAL)
+            current = snapshot(dirs, suffixes)
+            if current == known:
+                continue
+            # Wait for the burst to settle before acting on it
+            while True:
+                time.sleep(DEBOUNCE)
+                latest = snapshot(dirs, suffixes)
+                if latest == current:
+                    break
+                current = latest
+
+            changed = sorted(p for p in known.keys() | current.keys() if known.get(p) != current.get(p))
+            started = time.perf_counter()
+            print(f"\n{len(changed)} changed: {', '.join(p.name for p in changed)}")
+            try:
+                written = handle(changed) or ()
+            except Exception:
+                traceback.print_exc()
+                written = ()
+            print(f"Handled in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+            # Changes made by handle itself aren't new work; anything else
+            # that changed meanwhile is picked up on the next pass
+            after = snapshot(dirs, suffixes)
+            known = current
+            for path in written:
+                if path in after:
+                    known[path] = after[path]
+                else:
+                    known.pop(path, None)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        if fd is not None:
+            os.close(fd)
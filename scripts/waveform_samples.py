@@ -2,64 +2,168 @@
 
 Used by sound-check.py to pre-compute waveform data for the sound picker UI,
 avoiding runtime AVAudioFile processing in the app.
+
+Besides the fixed-width waveform, analyze() builds a waveform pyramid: RMS
+and peak levels at PYRAMID_MAX_BARS bars, then half as many, and so on
+down to PYRAMID_MIN_BARS. The app can serve any display width by picking
+a level, without touching the audio.
 """
 
-import numpy as np
-from scipy.io import wavfile
+import base64
 
+import numpy as np
 
-def _load_as_float_mono(audio_path):
-    """Load audio as mono float32 samples normalized to [-1, 1].
+from audio_decode import DecodedAudio, load_audio, to_float_mono
 
-    Uses scipy for WAV files (zero extra deps), falls back to pydub for MP3/others.
-    """
-    path = str(audio_path)
-    if path.lower().endswith(".wav"):
-        rate, data = wavfile.read(path)
-        arr = data.astype(np.float32)
-        # Normalize integer formats to [-1, 1]
-        if data.dtype == np.int16:
-            arr /= 32768.0
-        elif data.dtype == np.int32:
-            arr /= 2147483648.0
-        elif data.dtype == np.uint8:
-            arr = (arr - 128.0) / 128.0
-        # float32/float64 WAVs are already in [-1, 1]
-    else:
-        from pydub import AudioSegment
-        audio = AudioSegment.from_file(path)
-        raw = np.array(audio.get_array_of_samples(), dtype=np.float32)
-        bit_depth = audio.sample_width * 8
-        raw /= 2.0 ** (bit_depth - 1)
-        if audio.channels > 1:
-            arr = raw.reshape(-1, audio.channels)
-        else:
-            arr = raw
-
-    # Mix stereo (or multi-channel) down to mono by averaging channels
-    if arr.ndim > 1:
-        arr = arr.mean(axis=1)
-
-    return arr
-
-
-def compute_waveform(audio_path, bar_count=25):
-    """Return a list of normalized amplitudes (0.0–1.0) for waveform display.
+# Bump whenever a change here alters the numbers compute_waveform returns,
+# so cached waveforms (see sound-check.py) are recomputed.
+WAVEFORM_VERSION = 2
 
-    Loads audio, mixes to mono, splits into bar_count chunks,
-    and computes RMS amplitude per chunk.
-    """
-    samples = _load_as_float_mono(audio_path)
+# Frames mixed down and squared at a time; bounds peak memory for long files
+BLOCK_FRAMES = 1 << 18
 
-    if len(samples) == 0:
-        return [0.0] * bar_count
+# Pyramid levels: 512, 256, ..., 8 bars (powers of two)
+PYRAMID_MAX_BARS = 512
+PYRAMID_MIN_BARS = 8
 
-    # Split into bar_count chunks and compute RMS per chunk
-    chunks = np.array_split(samples, bar_count)
-    amplitudes = np.array([np.sqrt(np.mean(chunk ** 2)) for chunk in chunks])
 
+def _normalize(amplitudes):
+    """Scale amplitudes so the loudest bar is 1.0, rounded to 2 decimals."""
     max_amp = amplitudes.max()
     if max_amp > 0:
         amplitudes /= max_amp
 
     return [round(float(a), 2) for a in amplitudes]
+
+
+def _bar_edges(frame_count, bar_count):
+    """Frame index where each bar starts, plus the end, as np.array_split.
+
+    array_split gives the first (frame_count % bar_count) chunks one extra
+    frame.
+    """
+    base, extra = divmod(frame_count, bar_count)
+    bars = np.arange(bar_count + 1)
+    return bars * base + np.minimum(bars, extra)
+
+
+def _accumulate(audio, bar_counts, peak_bars=None):
+    """Per-bar sums of squares of the mono mixdown for each bar count, in one pass.
+
+    The samples are streamed in BLOCK_FRAMES-sized blocks: each block is
+    mixed down, squared and folded into per-bar float64 sums of squares.
+    Only one block's temporaries exist at a time, so with a memory-mapped
+    file peak memory stays bounded however long the audio is. With
+    peak_bars (one of bar_counts), the largest |sample| of each of those
+    bars is collected in the same pass.
+
+    Returns (edges, sums, peaks): {n: bar edges}, {n: sums of squares},
+    and the peak_bars peaks (or None).
+    """
+    frame_count = len(audio.samples)
+    edges = {n: _bar_edges(frame_count, n) for n in bar_counts}
+    sums = {n: np.zeros(n) for n in bar_counts}
+    peaks = np.zeros(peak_bars) if peak_bars else None
+
+    for start in range(0, frame_count, BLOCK_FRAMES):
+        block = audio.samples[start:start + BLOCK_FRAMES]
+        mono = to_float_mono(DecodedAudio(block, audio.frame_rate))
+        # Running sum of squares, so any span's energy is one subtraction
+        cumulative = np.zeros(len(mono) + 1)
+        np.cumsum(np.square(mono, dtype=np.float64), out=cumulative[1:])
+
+        for n in bar_counts:
+            # Each bar's overlap with this block, in block-local indices
+            cuts = np.clip(edges[n], start, start + len(mono)) - start
+            sums[n] += cumulative[cuts[1:]] - cumulative[cuts[:-1]]
+            if n == peak_bars:
+                # Bars overlapping the block are contiguous, so reduceat's
+                # segments between their starts are exactly their overlaps
+                hit = np.flatnonzero(cuts[1:] > cuts[:-1])
+                if len(hit):
+                    block_peaks = np.maximum.reduceat(np.abs(mono), cuts[hit])
+                    peaks[hit] = np.maximum(peaks[hit], block_peaks)
+    return edges, sums, peaks
+
+
+def _rms(sums, sizes):
+    """Per-bar RMS from sums of squares and frame counts."""
+    # Empty chunks (fewer samples than bars) read as silence
+    means = np.divide(sums, sizes, out=np.zeros(len(sums)), where=sizes > 0)
+    return np.sqrt(means)
+
+
+def _quantize(levels):
+    """Levels in 0.0–1.0, concatenated and base64-encoded one byte per bar."""
+    data = np.clip(np.rint(np.concatenate(levels) * 255), 0, 255).astype(np.uint8)
+    return base64.b64encode(data.tobytes()).decode()
+
+
+def _pyramid(edges, sums, peaks):
+    """The manifest form of a pyramid built from its finest level.
+
+    Each coarser level merges neighbouring pairs of bars (summing their
+    energy and frame counts, taking the larger peak), so every bar is
+    exactly the union of the two bars below it. RMS levels are normalized
+    like the waveform, loudest bar = 1.0 per level; peak levels share one
+    scale, the loudest sample in the file. Values are stored as bytes
+    (value = byte / 255), base64-encoded, finest level first.
+    """
+    sizes = np.diff(edges)
+    loudest = peaks.max()
+    bars, rms, peak = [], [], []
+    while True:
+        level = _rms(sums, sizes)
+        bars.append(len(level))
+        rms.append(level / level.max() if level.max() > 0 else level)
+        peak.append(peaks / loudest if loudest > 0 else peaks)
+        if len(level) // 2 < PYRAMID_MIN_BARS:
+            break
+        sums = sums.reshape(-1, 2).sum(axis=1)
+        sizes = sizes.reshape(-1, 2).sum(axis=1)
+        peaks = peaks.reshape(-1, 2).max(axis=1)
+    return {"bars": bars, "rms": _quantize(rms), "peak": _quantize(peak)}
+
+
+def compute_waveforms(audio, bar_counts):
+    """Return {bar_count: waveform} for several bar counts at once.
+
+    audio is a file path or an already-decoded DecodedAudio (e.g. a slice
+    of a larger buffer), in which case nothing is read from disk. WAV and
+    AIFF paths are memory-mapped, so the samples are read block by block
+    as they're analyzed rather than loaded up front. Every bar count is
+    accumulated in the same single pass.
+    """
+    if not isinstance(audio, DecodedAudio):
+        audio = load_audio(audio)
+
+    if len(audio.samples) == 0:
+        return {n: [0.0] * n for n in bar_counts}
+
+    edges, sums, _ = _accumulate(audio, bar_counts)
+    return {n: _normalize(_rms(sums[n], np.diff(edges[n]))) for n in bar_counts}
+
+
+def compute_waveform(audio, bar_count=25):
+    """Return a list of normalized amplitudes (0.0–1.0) for waveform display.
+
+    Loads audio (path or DecodedAudio), mixes to mono, splits into
+    bar_count chunks, and computes RMS amplitude per chunk.
+    """
+    return compute_waveforms(audio, [bar_count])[bar_count]
+
+
+def analyze(audio, bar_count=25):
+    """Return (waveform, pyramid) for audio, from one pass over the samples.
+
+    waveform is compute_waveform(audio, bar_count). pyramid is
+    {"bars": [512, 256, ..., 8], "rms": base64, "peak": base64}, each
+    base64 string holding every level's bars as bytes, finest level first.
+    """
+    if not isinstance(audio, DecodedAudio):
+        audio = load_audio(audio)
+
+    # With no frames every sum and peak stays 0, so everything reads as silence
+    edges, sums, peaks = _accumulate(audio, sorted({bar_count, PYRAMID_MAX_BARS}), PYRAMID_MAX_BARS)
+    waveform = _normalize(_rms(sums[bar_count], np.diff(edges[bar_count])))
+    return waveform, _pyramid(edges[PYRAMID_MAX_BARS], sums[PYRAMID_MAX_BARS], peaks)